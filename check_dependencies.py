@@ -1,4 +1,5 @@
 #!/usr/bin/env python3
+import re
 import sys
 
 
@@ -11,15 +12,28 @@ def check_python():
     return True
 
 
-def check_package(name, min_ver=None):
-    try:
-        from importlib.metadata import version
-        ver = version(name)
-        print(f"PASS: {name} {ver}")
-        return True
-    except:
+def _normalize(name):
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def installed_versions():
+    """Scan site-packages once: {normalized name: version}"""
+    from importlib.metadata import distributions
+    installed = {}
+    for dist in distributions():
+        name = dist.metadata['Name']
+        if name:  # broken .dist-info dirs can lack METADATA
+            installed[_normalize(name)] = dist.version
+    return installed
+
+
+def check_package(name, installed, min_ver=None):
+    ver = installed.get(_normalize(name))
+    if ver is None:
         print(f"FAIL: {name} not installed")
         return False
+    print(f"PASS: {name} {ver}")
+    return True
 
 
 def check_import(module, pkg=None):
@@ -47,10 +61,11 @@ def main():
 
     print("\n2. Required Packages")
     print("-" * 70)
-    all_ok &= check_package("hibachi-xyz", "0.1.14")
-    all_ok &= check_package("python-dotenv", "1.0.0")
-    all_ok &= check_package("requests", "2.31.0")
-    all_ok &= check_package("certifi")
+    installed = installed_versions()
+    all_ok &= check_package("hibachi-xyz", installed, "0.1.14")
+    all_ok &= check_package("python-dotenv", installed, "1.0.0")
+    all_ok &= check_package("requests", installed, "2.31.0")
+    all_ok &= check_package("certifi", installed)
 
     print("\n3. Import Tests")
     print("-" * 70)
@@ -4,7 +4,6 @@ import hibachi_xyz.types as types
 print("Available types in hibachi_xyz.types:")
 print("=" * 70)
 
-for attr in dir(types):
+for attr, obj in vars(types).items():
     if not attr.startswith('_'):
-        obj = getattr(types, attr)
         print(f"  {attr}: {type(obj)}")
\ No newline at end of file
@@ -1,14 +1,35 @@
 from __future__ import annotations
 import os
-from typing import Dict, Any
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional, Callable, Tuple
 from dotenv import load_dotenv
 
+_TRUE_SET = frozenset(('true', '1', 'yes', 'on'))
+
+_CONFIG_CACHE: Optional[Mapping[str, Any]] = None
+_VALIDATED_CONFIG: Optional[Mapping[str, Any]] = None
+
 
 def str_to_bool(value: str) -> bool:
-    return value.lower() in ('true', '1', 'yes', 'on')
+    return value.lower() in _TRUE_SET
+
+
+def load_env_config() -> Mapping[str, Any]:
+    """Build the config once; later calls return the same read-only mapping"""
+    global _CONFIG_CACHE
+    if _CONFIG_CACHE is None:
+        _CONFIG_CACHE = _freeze(_build_env_config())
+    return _CONFIG_CACHE
 
 
-def load_env_config() -> Dict[str, Any]:
+def _freeze(config: Dict[str, Any]) -> Mapping[str, Any]:
+    return MappingProxyType({
+        k: MappingProxyType(v) if isinstance(v, dict) else v
+        for k, v in config.items()
+    })
+
+
+def _build_env_config() -> Dict[str, Any]:
     load_dotenv()
 
     def get_env(key: str, default: Any = None) -> str:
@@ -27,7 +48,8 @@ def load_env_config() -> Dict[str, Any]:
                                   "https://data-api.hibachi.xyz"),
             "apiKey": get_env("HIBACHI_API_KEY"),
             "accountId": get_env("HIBACHI_ACCOUNT_ID"),
-            "privateKey": get_env("HIBACHI_PRIVATE_KEY")
+            "privateKey": get_env("HIBACHI_PRIVATE_KEY"),
+            "useWebsocket": str_to_bool(get_env("HIBACHI_USE_WS", "false"))
         },
         "bot": {
             "symbol": get_env("HIBACHI_SYMBOL", "BTC/USDT-P"),
@@ -47,40 +69,49 @@ def load_env_config() -> Dict[str, Any]:
             "bullBiasBps": float(get_env("BULL_BIAS_BPS", "25.0")),
             "requoteBps": float(get_env("REQUOTE_BPS", "10.0")),
             "postOnly": str_to_bool(get_env("POST_ONLY", "true")),
-            "timeInForce": get_env("TIME_IN_FORCE", "GTC"),
             "minNotional": float(get_env("MIN_NOTIONAL", "10.0")),
             "leverage": int(get_env("LEVERAGE", "1"))
         },
         "logging": {
             "level": get_env("LOG_LEVEL", "INFO"),
-            "dir": get_env("LOG_DIR", "logs")
+            "dir": get_env("LOG_DIR", "logs"),
+            "rotate": str_to_bool(get_env("LOG_ROTATE", "true"))
         }
     }
 
 
-def validate_config(config: Dict[str, Any]) -> bool:
-    bot = config["bot"]
+_VALID_TIMEFRAMES = ('1m', '3m', '5m', '15m', '30m', '1h', '2h', '4h', '6h', '12h', '1d')
 
-    assert 0.1 <= bot["baseOrderPct"] <= 100.0, "baseOrderPct must be 0.1-100"
-    assert 10.0 <= bot["invBudgetPct"] <= 100.0, "invBudgetPct must be 10-100"
-    assert bot["atrLen"] >= 1, "atrLen must be >= 1"
-    assert bot["kATR"] >= 0.1, "kATR must be >= 0.1"
-    assert bot["minFullBps"] >= 10.0, "minFullBps must be >= 10"
-    assert bot["maxFullBps"] > bot["minFullBps"], "maxFullBps must be > minFullBps"
-    assert 0.0 <= bot["skewDamp"] <= 1.0, "skewDamp must be 0-1"
-    assert bot["sizeAmp"] >= 0.5, "sizeAmp must be >= 0.5"
-    assert 1.0 <= bot["requoteBps"] <= 100.0, "requoteBps must be 1-100"
-    assert 1 <= bot["leverage"] <= 100, "leverage must be 1-100"
-    assert bot["minNotional"] >= 1.0, "minNotional must be >= 1"
+# (predicate over the "bot" section, message); checked in order, first failure wins
+_RULES: Tuple[Tuple[Callable[[Mapping[str, Any]], bool], str], ...] = (
+    (lambda b: 0.1 <= b["baseOrderPct"] <= 100.0, "baseOrderPct must be 0.1-100"),
+    (lambda b: 10.0 <= b["invBudgetPct"] <= 100.0, "invBudgetPct must be 10-100"),
+    (lambda b: b["atrLen"] >= 1, "atrLen must be >= 1"),
+    (lambda b: b["kATR"] >= 0.1, "kATR must be >= 0.1"),
+    (lambda b: b["minFullBps"] >= 10.0, "minFullBps must be >= 10"),
+    (lambda b: b["maxFullBps"] > b["minFullBps"], "maxFullBps must be > minFullBps"),
+    (lambda b: 0.0 <= b["skewDamp"] <= 1.0, "skewDamp must be 0-1"),
+    (lambda b: b["sizeAmp"] >= 0.5, "sizeAmp must be >= 0.5"),
+    (lambda b: 1.0 <= b["requoteBps"] <= 100.0, "requoteBps must be 1-100"),
+    (lambda b: 1 <= b["leverage"] <= 100, "leverage must be 1-100"),
+    (lambda b: b["minNotional"] >= 1.0, "minNotional must be >= 1"),
+    (lambda b: "/" in b["symbol"], "symbol must be in format 'BASE/QUOTE-P' (e.g. BTC/USDT-P)"),
+    (lambda b: b["atrTimeframe"] in _VALID_TIMEFRAMES,
+     f"atrTimeframe must be one of: {', '.join(_VALID_TIMEFRAMES)}"),
+    (lambda b: not b["useBullBias"] or b["bullBiasBps"] < b["minFullBps"],
+     "bullBiasBps should be < minFullBps to avoid excessive skew"),
+)
 
-    assert "/" in bot["symbol"], "symbol must be in format 'BASE/QUOTE-P' (e.g. BTC/USDT-P)"
 
-    valid_timeframes = ['1m', '3m', '5m', '15m', '30m', '1h', '2h', '4h', '6h', '12h', '1d']
-    assert bot["atrTimeframe"] in valid_timeframes, \
-        f"atrTimeframe must be one of: {', '.join(valid_timeframes)}"
+def validate_config(config: Mapping[str, Any]) -> bool:
+    global _VALIDATED_CONFIG
+    if config is _VALIDATED_CONFIG:
+        return True
 
-    if bot["useBullBias"]:
-        assert bot["bullBiasBps"] < bot["minFullBps"], \
-            "bullBiasBps should be < minFullBps to avoid excessive skew"
+    bot = config["bot"]
+    for pred, msg in _RULES:
+        if not pred(bot):
+            raise AssertionError(msg)
 
+    _VALIDATED_CONFIG = config
     return True
\ No newline at end of file
@@ -1,19 +1,172 @@
 from __future__ import annotations
+import functools
 import logging
-from typing import Dict, Any, Optional, List
+import operator
+import threading
+import time
+from decimal import Decimal
+from typing import Dict, Any, Optional, List, Callable, Tuple, Union
 
 try:
-    from hibachi_xyz import HibachiApiClient
-    from hibachi_xyz.types import Side
-except ImportError:
-    raise ImportError("Install: pip install hibachi-xyz")
+    import orjson
+except ImportError:  # optional; the stdlib decoder is used without it
+    orjson = None
 
 log = logging.getLogger("hibachi.client")
 
+# Exchange metadata (tick/step sizes, contract list) is near-static
+EXCHANGE_INFO_TTL = 300.0
+# Coalesces mid-price lookups made within the same quoting tick
+MID_PRICE_TTL = 0.1
+
+# Optional SDK methods, resolved once per client in HibachiRest.__init__
+_CAPABILITIES = (
+    'set_leverage', 'update_leverage', 'change_leverage',
+    'get_inventory', 'get_prices', 'get_pending_orders', 'get_open_orders',
+    'get_klines', 'batch_orders',
+)
+
+def _parse_price(value: Any) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
+Number = Union[float, str, Decimal]
+
+
+def _as_float(value: Number) -> float:
+    """Convert at the SDK boundary; floats pass through unparsed"""
+    return value if type(value) is float else float(value)
+
+
+_BIDS_ASKS = operator.itemgetter('bids', 'asks')
+
+_PASSTHROUGH_TYPES = (str, int, float, bool, dict, list, tuple)
+
+def _identity(obj: Any) -> Any:
+    return obj
+
+
+@functools.lru_cache(maxsize=64)
+def _make_converter(t: type) -> Callable[[Any], Any]:
+    """Pick the dict conversion for instances of t (bounded per-type cache)"""
+    if getattr(t, '__dictoffset__', 0):
+        return vars
+    if hasattr(t, 'model_dump'):
+        return lambda o: o.model_dump()
+    if hasattr(t, 'dict'):
+        return lambda o: o.dict()
+    return _identity
+
+
+class _SessionRequests:
+    """Stands in for `requests` inside the SDK so its calls share one pooled Session"""
+
+    def __init__(self, module: Any, session: Any):
+        self._module = module
+        self._session = session
+
+    def get(self, url: str, **kwargs: Any) -> Any:
+        return self._session.get(url, **kwargs)
+
+    def request(self, method: str, url: str, **kwargs: Any) -> Any:
+        return self._session.request(method, url, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        # Response, exceptions, etc. still come from the real module
+        return getattr(self._module, name)
+
+
+def _orjson_response(response: Any, *args: Any, **kwargs: Any) -> Any:
+    """Session response hook: decode .json() with orjson straight from the body bytes"""
+    def _json(**_: Any) -> Any:
+        try:
+            return orjson.loads(response.content)
+        except orjson.JSONDecodeError as e:
+            # Callers catch requests' decode error, as response.json() raises it
+            from requests.exceptions import JSONDecodeError
+            raise JSONDecodeError(e.msg, e.doc, e.pos) from e
+
+    response.json = _json
+    return response
+
+
+# The shared session behind the SDK shim; see install_pooled_session()
+_pool_lock = threading.Lock()
+_pooled_session: Any = None
+_pooled_users = 0
+
+
+def install_pooled_session() -> Any:
+    """Route the SDK's module-level requests.get/request through a keep-alive Session
+
+    Process-wide: the SDK looks `requests` up as a module global, so every
+    HibachiApiClient in the process goes through the one shared session.
+    The shim is installed on the first call; later calls return the same
+    session. Pair each call with release_pooled_session().
+    """
+    global _pooled_session, _pooled_users
+    with _pool_lock:
+        if _pooled_session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            import hibachi_xyz.api as sdk_api
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=0)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers["Connection"] = "keep-alive"
+            if orjson is not None:
+                session.hooks["response"].append(_orjson_response)
+
+            if hasattr(sdk_api, "requests"):
+                sdk_api.requests = _SessionRequests(requests, session)
+            else:
+                log.warning("SDK HTTP transport not found; connections will not be pooled")
+            _pooled_session = session
+        _pooled_users += 1
+        return _pooled_session
+
+
+def release_pooled_session() -> None:
+    """Drop one install_pooled_session() user; the last one restores the SDK's requests"""
+    global _pooled_session, _pooled_users
+    with _pool_lock:
+        if _pooled_users == 0:
+            return
+        _pooled_users -= 1
+        if _pooled_users:
+            return
+        import hibachi_xyz.api as sdk_api
+
+        shim = getattr(sdk_api, "requests", None)
+        if isinstance(shim, _SessionRequests):
+            sdk_api.requests = shim._module
+        _pooled_session.close()
+        _pooled_session = None
+
 
 class HibachiRest:
+    MAX_FEES_PERCENT = 0.01
+
     def __init__(self, api_url: str, data_api_url: str, api_key: str,
                  account_id: str, private_key: str):
+        # SDK import is deferred so importing this module stays cheap
+        try:
+            from hibachi_xyz import HibachiApiClient
+            from hibachi_xyz.types import Side
+        except ImportError:
+            raise ImportError("Install: pip install hibachi-xyz")
+
+        self._side_map = {
+            'BUY': Side.BUY, 'SELL': Side.SELL,
+            'buy': Side.BUY, 'sell': Side.SELL,
+        }
         self.client = HibachiApiClient(
             api_url=api_url,
             data_api_url=data_api_url,
@@ -21,45 +174,55 @@ class HibachiRest:
             account_id=account_id,
             private_key=private_key
         )
+        self.session = install_pooled_session()
+        self._caps: Dict[str, Optional[Callable[..., Any]]] = {
+            name: getattr(self.client, name, None) for name in _CAPABILITIES
+        }
+        self._exchange_info_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+        self._contract_index: Optional[Dict[str, Dict[str, Any]]] = None
+        self._contract_index_src: Optional[Dict[str, Any]] = None
+        self._mid_cache: Dict[str, Tuple[float, float]] = {}
         log.info("Hibachi client initialized")
 
+    def close(self) -> None:
+        """Release this client's hold on the shared HTTP session (idempotent)"""
+        if self.session is not None:
+            self.session = None
+            release_pooled_session()
+
+    def __enter__(self) -> "HibachiRest":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
     def _convert_to_dict(self, obj: Any) -> Any:
-        """Convert Pydantic model to dict recursively"""
-        if hasattr(obj, 'model_dump'):
-            return obj.model_dump()
-        elif hasattr(obj, 'dict'):
-            return obj.dict()
-        elif hasattr(obj, '__dict__'):
-            result = {}
-            for key in dir(obj):
-                if not key.startswith('_'):
-                    val = getattr(obj, key, None)
-                    if val is not None and not callable(val):
-                        result[key] = val
-            return result
-        return obj
+        """Convert SDK response object to dict (shallow)"""
+        if obj is None or isinstance(obj, _PASSTHROUGH_TYPES):
+            return obj
+        return _make_converter(type(obj))(obj)
 
     def set_leverage(self, symbol: str, leverage: int) -> Dict[str, Any]:
         """Set leverage for symbol"""
         try:
-            if hasattr(self.client, 'set_leverage'):
-                result = self.client.set_leverage(
+            if self._caps['set_leverage'] is not None:
+                result = self._caps['set_leverage'](
                     symbol=symbol,
                     leverage=leverage
                 )
                 log.info("✓ Leverage set to %dx for %s via SDK", leverage, symbol)
                 return self._convert_to_dict(result)
 
-            elif hasattr(self.client, 'update_leverage'):
-                result = self.client.update_leverage(
+            elif self._caps['update_leverage'] is not None:
+                result = self._caps['update_leverage'](
                     symbol=symbol,
                     leverage=leverage
                 )
                 log.info("✓ Leverage set to %dx for %s via update_leverage", leverage, symbol)
                 return self._convert_to_dict(result)
 
-            elif hasattr(self.client, 'change_leverage'):
-                result = self.client.change_leverage(
+            elif self._caps['change_leverage'] is not None:
+                result = self._caps['change_leverage'](
                     symbol=symbol,
                     leverage=leverage
                 )
@@ -68,8 +231,9 @@ class HibachiRest:
 
             else:
                 log.warning("⚠ SDK does not support leverage methods")
-                log.warning("⚠ Available methods: %s",
-                            [m for m in dir(self.client) if not m.startswith('_')])
+                if log.isEnabledFor(logging.WARNING):
+                    log.warning("⚠ Available methods: %s",
+                                [m for m in dir(self.client) if not m.startswith('_')])
                 return {"status": "not_supported", "message": "Manual setup required"}
 
         except Exception as e:
@@ -87,53 +251,68 @@ class HibachiRest:
         return float(info.get('balance', 0))
 
     def get_exchange_info(self) -> Dict[str, Any]:
-        """Get exchange information including all trading pairs"""
-        result = self.client.get_exchange_info()
-        return self._convert_to_dict(result)
+        """Get exchange information including all trading pairs (cached)"""
+        now = time.monotonic()
+        cached = self._exchange_info_cache
+        if cached and now - cached[0] < EXCHANGE_INFO_TTL:
+            return cached[1]
+
+        result = self._convert_to_dict(self.client.get_exchange_info())
+        self._exchange_info_cache = (now, result)
+        return result
 
     def get_contract_info(self, symbol: str) -> Optional[Dict[str, Any]]:
         """Get specific contract information"""
         info = self.get_exchange_info()
-
+        if self._contract_index is None or self._contract_index_src is not info:
+            self._contract_index = self._build_contract_index(info)
+            self._contract_index_src = info
+
+        contract = self._contract_index.get(symbol)
+        if contract is None:
+            log.error("Contract %s not found. Available: %s",
+                      symbol, list(self._contract_index))
+        return contract
+
+    def _build_contract_index(self, info: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Index contracts by symbol; rebuilt only when exchange info refreshes"""
         contracts = (info.get('futureContracts') or
                      info.get('future_contracts') or
                      info.get('contracts') or [])
 
+        _convert = self._convert_to_dict
+        index = {}
         for contract in contracts:
-            contract_dict = self._convert_to_dict(contract)
-            if contract_dict.get('symbol') == symbol:
-                return contract_dict
+            contract_dict = _convert(contract)
+            index[contract_dict.get('symbol')] = contract_dict
+        return index
 
-        available = [self._convert_to_dict(c).get('symbol') for c in contracts]
-        log.error(f"Contract {symbol} not found. Available: {available}")
-        return None
-
-    def get_positions(self) -> List[Dict[str, Any]]:
-        """Get all positions - uses get_inventory"""
+    def _iter_positions_raw(self) -> List[Any]:
+        """Get all positions as returned by the SDK (unconverted)"""
         try:
-            if hasattr(self.client, 'get_inventory'):
-                result = self.client.get_inventory()
+            get_inventory = self._caps['get_inventory']
+            if get_inventory is not None:
+                result = get_inventory()
                 if not result:
                     return []
-                inventory = self._convert_to_dict(result)
-                positions = inventory.get('positions', [])
-                if isinstance(positions, list):
-                    return [self._convert_to_dict(p) for p in positions]
-                return []
-
-            account = self.get_account_info()
-            positions = account.get('positions', [])
-            if isinstance(positions, list):
-                return [self._convert_to_dict(p) for p in positions]
-            return []
+                positions = self._convert_to_dict(result).get('positions', [])
+            else:
+                positions = self.get_account_info().get('positions', [])
+            return positions if isinstance(positions, list) else []
 
         except Exception as e:
             log.debug("No positions found: %s", e)
             return []
 
+    def get_positions(self) -> List[Dict[str, Any]]:
+        """Get all positions - uses get_inventory"""
+        return list(map(self._convert_to_dict, self._iter_positions_raw()))
+
     def get_position(self, symbol: str) -> Optional[Dict[str, Any]]:
         """Get position for specific symbol"""
-        for pos in self.get_positions():
+        _convert = self._convert_to_dict
+        for p in self._iter_positions_raw():
+            pos = _convert(p)
             if pos.get('symbol') == symbol:
                 return pos
         return None
@@ -163,8 +342,9 @@ class HibachiRest:
     def get_prices(self, symbol: str) -> Optional[Dict[str, Any]]:
         """Get current prices for symbol"""
         try:
-            if hasattr(self.client, 'get_prices'):
-                result = self.client.get_prices(symbol=symbol)
+            get_prices = self._caps['get_prices']
+            if get_prices is not None:
+                result = get_prices(symbol=symbol)
                 return self._convert_to_dict(result)
             return None
         except Exception as e:
@@ -172,13 +352,15 @@ class HibachiRest:
             return None
 
     def get_mid_price(self, symbol: str) -> Optional[float]:
-        """Get mid price - tries multiple methods"""
-        mid = self._get_mid_from_prices(symbol)
-        if mid:
-            return mid
+        """Get mid price - tries multiple methods (cached for MID_PRICE_TTL)"""
+        now = time.monotonic()
+        cached = self._mid_cache.get(symbol)
+        if cached and now - cached[0] < MID_PRICE_TTL:
+            return cached[1]
 
-        mid = self._get_mid_from_orderbook(symbol)
+        mid = self._get_mid_from_prices(symbol) or self._get_mid_from_orderbook(symbol)
         if mid:
+            self._mid_cache[symbol] = (now, mid)
             return mid
 
         log.warning("Unable to get mid price for %s", symbol)
@@ -186,59 +368,45 @@ class HibachiRest:
 
     def _get_mid_from_prices(self, symbol: str) -> Optional[float]:
         """Get mid price from prices API"""
-        try:
-            prices = self.get_prices(symbol)
-            if not prices:
-                return None
-
-            mark = prices.get('markPrice') or prices.get('mark_price')
-            if mark:
-                return float(mark)
+        prices = self.get_prices(symbol)
+        if not prices:
+            return None
 
-            last = prices.get('lastPrice') or prices.get('last_price')
-            if last:
-                return float(last)
+        mark = _parse_price(prices.get('markPrice') or prices.get('mark_price'))
+        if mark:
+            return mark
 
-            return None
-        except Exception as e:
-            log.debug("Failed to get mid from prices: %s", e)
-            return None
+        return _parse_price(prices.get('lastPrice') or prices.get('last_price'))
 
     def _get_mid_from_orderbook(self, symbol: str) -> Optional[float]:
         """Get mid price from orderbook"""
-        try:
-            orderbook = self.get_orderbook(symbol, depth=1)
-            if not orderbook:
-                return None
-
-            bids = orderbook.get('bids', [])
-            asks = orderbook.get('asks', [])
+        orderbook = self.get_orderbook(symbol, depth=1)
+        if not orderbook:
+            return None
 
-            if not bids or not asks:
-                return None
+        try:
+            bids, asks = _BIDS_ASKS(orderbook)
+        except KeyError:
+            return None
+        if not bids or not asks or not isinstance(bids, list) or not isinstance(asks, list):
+            return None
 
-            best_bid = self._parse_orderbook_level(bids[0])
-            best_ask = self._parse_orderbook_level(asks[0])
+        best_bid = self._parse_orderbook_level(bids[0])
+        best_ask = self._parse_orderbook_level(asks[0])
 
-            if best_bid and best_ask and best_bid > 0 and best_ask > 0:
-                return (best_bid + best_ask) / 2
+        if best_bid and best_ask and best_bid > 0 and best_ask > 0:
+            return (best_bid + best_ask) / 2
 
-            return None
-        except Exception as e:
-            log.debug("Failed to get mid from orderbook: %s", e)
-            return None
+        return None
 
     def _parse_orderbook_level(self, level) -> Optional[float]:
         """Parse orderbook level (supports list, dict, or scalar)"""
-        try:
-            if isinstance(level, list):
-                return float(level[0])
-            elif isinstance(level, dict):
-                return float(level.get('price', 0))
-            else:
-                return float(level)
-        except (ValueError, TypeError):
-            return None
+        t = type(level)
+        if t is list or t is tuple:
+            return _parse_price(level[0]) if level else None
+        if t is dict:
+            return _parse_price(level.get('price', 0))
+        return _parse_price(level)
 
     def get_ticker(self, symbol: str) -> Optional[Dict[str, Any]]:
         """Get ticker - uses get_prices"""
@@ -256,66 +424,70 @@ class HibachiRest:
         return None
 
     def place_order(self, symbol: str, side: str, order_type: str,
-                    quantity: str, price: Optional[str] = None,
+                    quantity: Number, price: Optional[Number] = None,
                     time_in_force: str = 'GTC', reduce_only: bool = False,
                     post_only: bool = False,
                     client_order_id: Optional[str] = None) -> Dict[str, Any]:
 
-        side_upper = side.upper()
-        if side_upper == "BUY":
-            side_enum = Side.BUY
-        elif side_upper == "SELL":
-            side_enum = Side.SELL
-        else:
-            raise ValueError(f"Invalid side: {side}. Must be 'BUY' or 'SELL'")
-
-        max_fees_percent = 0.01
+        side_enum = self._side_enum(side)
+        max_fees_percent = self.MAX_FEES_PERCENT
 
         if order_type == "LIMIT" and price:
             try:
                 result = self.client.place_limit_order(
                     symbol=symbol,
                     side=side_enum,
-                    quantity=float(quantity),
-                    price=float(price),
-                    max_fees_percent=max_fees_percent
+                    quantity=_as_float(quantity),
+                    price=_as_float(price),
+                    max_fees_percent=max_fees_percent,
+                    order_flags=self._order_flags(post_only)
                 )
 
-                # API возвращает tuple (timestamp, order_id)
-                if isinstance(result, tuple):
-                    log.debug("API returned tuple, length: %d", len(result))
-                    if len(result) >= 2:
-                        # Создаем dict с order_id из tuple
-                        result = {"orderId": str(result[-1])}
-                        log.debug("Extracted order_id from tuple: %s", result["orderId"])
-                    else:
-                        result = {"orderId": str(result[0])} if result else {}
-
-                return self._convert_to_dict(result)
+                return self._order_result(result)
             except Exception as e:
-                log.error(f"place_limit_order failed: {e}")
-                log.error(f"  Symbol: {symbol}, Side: {side}")
-                log.error(f"  Price: {price}, Quantity: {quantity}")
+                log.error("place_limit_order failed: %s", e)
+                log.error("  Symbol: %s, Side: %s", symbol, side)
+                log.error("  Price: %s, Quantity: %s", price, quantity)
                 raise
         elif order_type == "MARKET":
             result = self.client.place_market_order(
                 symbol=symbol,
                 side=side_enum,
-                quantity=float(quantity),
+                quantity=_as_float(quantity),
                 max_fees_percent=max_fees_percent
             )
+            return self._order_result(result)
+        else:
+            raise ValueError(f"Unsupported order type: {order_type}")
 
-            if isinstance(result, tuple):
+    def _side_enum(self, side: str):
+        side_enum = self._side_map.get(side) or self._side_map.get(side.upper())
+        if side_enum is None:
+            raise ValueError(f"Invalid side: {side}. Must be 'BUY' or 'SELL'")
+        return side_enum
+
+    @staticmethod
+    def _order_flags(post_only: bool):
+        if not post_only:
+            return None
+        from hibachi_xyz.types import OrderFlags
+        return OrderFlags.PostOnly
+
+    def _order_result(self, result: Any) -> Dict[str, Any]:
+        """Normalize place_*_order response to a dict with orderId"""
+        # API возвращает tuple (timestamp, order_id)
+        if isinstance(result, tuple):
+            debug = log.isEnabledFor(logging.DEBUG)
+            if debug:
                 log.debug("API returned tuple, length: %d", len(result))
-                if len(result) >= 2:
-                    result = {"orderId": str(result[-1])}
-                    log.debug("Extracted order_id from tuple: %s", result["orderId"])
-                else:
-                    result = {"orderId": str(result[0])} if result else {}
+            if len(result) >= 2:
+                order_id = str(result[-1])
+                if debug:
+                    log.debug("Extracted order_id from tuple: %s", order_id)
+                return {"orderId": order_id}
+            return {"orderId": str(result[0])} if result else {}
 
-            return self._convert_to_dict(result)
-        else:
-            raise ValueError(f"Unsupported order type: {order_type}")
+        return self._convert_to_dict(result)
 
     def cancel_order(self, symbol: str, order_id: Optional[str] = None,
                      client_order_id: Optional[str] = None) -> Dict[str, Any]:
@@ -339,6 +511,68 @@ class HibachiRest:
             log.error("Cancel order failed for order_id %s: %s", order_id, e)
             return {"status": "error", "message": str(e)}
 
+    def batch_orders(self, actions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Send cancels and limit orders as one signed batch request
+
+        Each action is {"action": "cancel", "symbol", "orderId"},
+        {"action": "place", "symbol", "side", "price", "quantity"} or
+        {"action": "amend", "symbol", "orderId", "side", "price", "quantity"};
+        places and amends may add "postOnly": True.
+        Returns one result dict per action, in the same order; the SDK raises
+        if the exchange rejects any of them. Falls back to one request per
+        action if the SDK has no batch endpoint.
+        """
+        batch = self._caps['batch_orders']
+        if batch is None:
+            return [self._run_action(a) for a in actions]
+
+        from hibachi_xyz.types import CreateOrder, CancelOrder, UpdateOrder
+
+        orders = []
+        for a in actions:
+            if a["action"] == "cancel":
+                orders.append(CancelOrder(order_id=int(a["orderId"])))
+            elif a["action"] == "amend":
+                orders.append(UpdateOrder(
+                    int(a["orderId"]), a["symbol"], self._side_enum(a["side"]),
+                    _as_float(a["quantity"]), self.MAX_FEES_PERCENT,
+                    price=_as_float(a["price"]),
+                    order_flags=self._order_flags(a.get("postOnly", False))
+                ))
+            else:
+                orders.append(CreateOrder(
+                    a["symbol"], self._side_enum(a["side"]),
+                    _as_float(a["quantity"]), self.MAX_FEES_PERCENT,
+                    price=_as_float(a["price"]),
+                    order_flags=self._order_flags(a.get("postOnly", False))
+                ))
+
+        result = self._convert_to_dict(batch(orders))
+        statuses = result.get('orders') or result.get('statuses') or []
+        return list(map(self._convert_to_dict, statuses))
+
+    def amend_order(self, symbol: str, order_id: str, quantity: Number,
+                    price: Number) -> Dict[str, Any]:
+        """Move a resting limit order to a new price/quantity in place"""
+        result = self.client.update_order(
+            int(order_id), self.MAX_FEES_PERCENT,
+            quantity=_as_float(quantity), price=_as_float(price)
+        )
+        return self._convert_to_dict(result)
+
+    def _run_action(self, action: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            if action["action"] == "cancel":
+                return self.cancel_order(action["symbol"], order_id=action["orderId"])
+            if action["action"] == "amend":
+                return self.amend_order(action["symbol"], action["orderId"],
+                                        action["quantity"], action["price"])
+            return self.place_order(action["symbol"], action["side"], "LIMIT",
+                                    action["quantity"], action["price"],
+                                    post_only=action.get("postOnly", False))
+        except Exception as e:
+            return {"status": "error", "message": str(e)}
+
     def cancel_all_orders(self, symbol: Optional[str] = None) -> Dict[str, Any]:
         """Cancel all orders for symbol"""
         try:
@@ -357,16 +591,15 @@ class HibachiRest:
 
     def get_open_orders(self, symbol: Optional[str] = None) -> List[Dict]:
         try:
-            if hasattr(self.client, 'get_pending_orders'):
-                result = self.client.get_pending_orders(symbol=symbol) if symbol else self.client.get_pending_orders()
-            else:
-                result = self.client.get_open_orders(symbol=symbol) if symbol else self.client.get_open_orders()
+            get_orders = self._caps['get_pending_orders'] or self._caps['get_open_orders']
+            result = get_orders(symbol=symbol) if symbol else get_orders()
 
             if not result:
                 return []
+            conv = self._convert_to_dict
             if isinstance(result, list):
-                return [self._convert_to_dict(order) for order in result]
-            return [self._convert_to_dict(result)]
+                return list(map(conv, result))
+            return [conv(result)]
         except Exception as e:
             log.error("Failed to get open orders: %s", e)
             return []
@@ -375,8 +608,9 @@ class HibachiRest:
                    limit: int = 20) -> Optional[List]:
         """Get historical klines/candles"""
         try:
-            if hasattr(self.client, 'get_klines'):
-                result = self.client.get_klines(
+            get_klines = self._caps['get_klines']
+            if get_klines is not None:
+                result = get_klines(
                     symbol=symbol,
                     interval=interval,
                     limit=limit
@@ -1,19 +1,123 @@
 from __future__ import annotations
 import logging, csv, os, random, time
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple, Optional, Tuple
 from dataclasses import dataclass, field
 
-from utils import ATR, bps_to_price, pct_of, clamp, ContractSpec, get_precision
+from utils import ATR, ContractSpec, get_precision, klines_to_bars, now_ms, to_float
 from hibachi_client import HibachiRest
+from hibachi_ws import HibachiWS
 
 log = logging.getLogger("hibachi.mm")
 
+# 🔧 FIX: Enforce minimum spread from mid (safety margin)
+MIN_SPREAD_PCT = 0.0015  # 0.15% минимум от mid
+
+
+def _ticker_price(ticker: Optional[dict]) -> Optional[float]:
+    """Mark price (else last) from a get_ticker() result, as get_mid_price reads it"""
+    if ticker:
+        return (to_float(ticker.get('markPrice') or ticker.get('mark_price')) or
+                to_float(ticker.get('lastPrice') or ticker.get('last_price')))
+    return None
+
+
+def _extract_funding_rate(ticker: Optional[dict]) -> Optional[float]:
+    if ticker:
+        return to_float(ticker.get('fundingRate') or ticker.get('funding_rate'))
+    return None
+
+
+@dataclass(frozen=True)
+class MMParams:
+    """Strategy settings from the "bot" config section, read once at startup"""
+    base_order_pct: float
+    inv_budget_pct: float
+    atr_len: int
+    k_atr: float
+    min_full_bps: float
+    max_full_bps: float
+    slip_guard_atr: float = 0.0
+    skew_damp: float = 0.3
+    size_amp: float = 1.5
+    requote_bps: float = 10.0
+    use_bull_bias: bool = False
+    bull_bias_bps: float = 0.0
+    long_bias_only: bool = False
+    atr_timeframe: str = "5m"
+    post_only: bool = True
+
+    @classmethod
+    def from_config(cls, cfg) -> "MMParams":
+        return cls(
+            base_order_pct=float(cfg["baseOrderPct"]),
+            inv_budget_pct=float(cfg["invBudgetPct"]),
+            atr_len=int(cfg["atrLen"]),
+            k_atr=float(cfg["kATR"]),
+            min_full_bps=float(cfg["minFullBps"]),
+            max_full_bps=float(cfg["maxFullBps"]),
+            slip_guard_atr=float(cfg.get("slipGuardATR", 0)),
+            skew_damp=float(cfg.get("skewDamp", 0.3)),
+            size_amp=float(cfg.get("sizeAmp", 1.5)),
+            requote_bps=float(cfg.get("requoteBps", 10.0)),
+            use_bull_bias=bool(cfg.get("useBullBias", False)),
+            bull_bias_bps=float(cfg.get("bullBiasBps", 0)),
+            long_bias_only=bool(cfg.get("longBiasOnly", False)),
+            atr_timeframe=cfg.get("atrTimeframe", "5m"),
+            post_only=bool(cfg.get("postOnly", True)),
+        )
+
 
-def _to_float(x) -> Optional[float]:
-    try:
-        return float(x) if x is not None else None
-    except:
-        return None
+class QuoteParams(NamedTuple):
+    """Config values used by compute_quotes(), pre-divided into fractions"""
+    k_atr: float
+    min_full_half_frac: float
+    max_full_half_frac: float
+    bull_bias_frac: float
+    skew_damp: float
+    size_amp: float
+    inv_budget_frac: float
+    base_order_frac: float
+
+
+def compute_quotes(mid: float, atr_val: float, pos_qty: float, equity: float,
+                   qp: QuoteParams) -> Tuple[float, float, float, float, float, float]:
+    """Unquantized quotes: (bid_px, ask_px, bid_qty, ask_qty, skew, half_w)
+
+    Quantities are 0.0 when their price is not positive.
+    """
+    # Clamps: upper bound first, then lower, so the floor wins if they cross
+    max_notional = equity * qp.inv_budget_frac
+    skew = pos_qty * mid / max_notional if max_notional > 0 else 0
+    if skew > 1.0:
+        skew = 1.0
+    if skew < -1.0:
+        skew = -1.0
+
+    half_w = qp.k_atr * atr_val
+    half_ceil = mid * qp.max_full_half_frac
+    if half_w > half_ceil:
+        half_w = half_ceil
+    half_floor = mid * qp.min_full_half_frac
+    if half_w < half_floor:
+        half_w = half_floor
+    bull_shift = mid * qp.bull_bias_frac
+
+    sgn = 1.0 if skew > 0 else (-1.0 if skew < 0 else 0.0)
+    inv_offset = qp.skew_damp * abs(skew) * half_w * sgn
+
+    # Проверяем, что bid ниже mid, а ask выше mid
+    min_offset = mid * MIN_SPREAD_PCT
+    bid_px = min(mid - half_w + bull_shift - inv_offset, mid - min_offset)
+    ask_px = max(mid + half_w + bull_shift - inv_offset, mid + min_offset)
+
+    base_usd = equity * qp.base_order_frac
+    bid_mult = 1.0 + qp.size_amp * max(0.0, -skew)
+    ask_mult = 1.0 + qp.size_amp * max(0.0, skew)
+
+    bid_qty = base_usd * bid_mult / bid_px if bid_px > 0 else 0.0
+    ask_qty = base_usd * ask_mult / ask_px if ask_px > 0 else 0.0
+    return bid_px, ask_px, bid_qty, ask_qty, skew, half_w
 
 
 @dataclass
@@ -42,24 +146,30 @@ class MMState:
     pos_qty: float = 0.0
     mark_price: float = 0.0
     last_bar: Bar = field(default_factory=Bar)
-    last_equity_update: float = 0.0
+    last_equity_update: float = float("-inf")
     order_count_1min: int = 0
-    last_order_reset: float = 0.0
+    last_order_reset: float = float("-inf")
     quote_count: int = 0
 
 
 class HibachiMarketMakerEngine:
-    def __init__(self, rest: HibachiRest, cfg: dict, logs_dir: str):
+    def __init__(self, rest: HibachiRest, cfg: dict, logs_dir: str,
+                 ws: Optional[HibachiWS] = None):
         self.rest = rest
+        # Optional push feed; REST stays the cold-start and stale-data fallback
+        self.ws = ws
         self.cfg = cfg
         self.symbol = cfg["symbol"]
-        self.params = cfg
+        self.p = MMParams.from_config(cfg)
         self.state = MMState()
         self.contract: Optional[ContractSpec] = None
-        self.atr = ATR(int(cfg["atrLen"]))
+        self.atr = ATR(self.p.atr_len)
         self.trades_log_path = os.path.join(logs_dir, "trades.csv")
         self._ensure_trade_log_header()
         self.max_orders_per_min = 30
+        self._cache_params()
+        # REST calls inside step() are independent reads; fan them out
+        self._pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="mm-rest")
 
         self.target_leverage = int(cfg.get("leverage", 1))
         if self.target_leverage != 1:
@@ -68,6 +178,25 @@ class HibachiMarketMakerEngine:
             log.warning("⚠️ Forcing leverage=1 for safety")
             self.target_leverage = 1
 
+    def _cache_params(self):
+        """Pre-divide the bps/pct config values that step() scales by mid or equity."""
+        p = self.p
+        self._requote_frac = p.requote_bps / 10000.0
+        self._inv_budget_frac = p.inv_budget_pct / 100
+        self._qp = QuoteParams(
+            k_atr=p.k_atr,
+            min_full_half_frac=(p.min_full_bps * 0.5) / 10000.0,
+            max_full_half_frac=(p.max_full_bps * 0.5) / 10000.0,
+            bull_bias_frac=p.bull_bias_bps / 10000.0 if p.use_bull_bias else 0.0,
+            skew_damp=p.skew_damp,
+            size_amp=p.size_amp,
+            inv_budget_frac=self._inv_budget_frac,
+            base_order_frac=p.base_order_pct / 100.0,
+        )
+        # set from the contract in bootstrap_markets()
+        self._price_precision = 2
+        self._qty_precision = 3
+
     def _ensure_trade_log_header(self):
         if not os.path.exists(self.trades_log_path):
             os.makedirs(os.path.dirname(self.trades_log_path), exist_ok=True)
@@ -77,7 +206,7 @@ class HibachiMarketMakerEngine:
                 ])
 
     def _check_rate_limit(self) -> bool:
-        now = time.time()
+        now = time.monotonic()
         if now - self.state.last_order_reset >= 60:
             self.state.order_count_1min = 0
             self.state.last_order_reset = now
@@ -109,6 +238,8 @@ class HibachiMarketMakerEngine:
             min_notional=float(min_notional),
             contract_size=float(contract_size)
         )
+        self._price_precision = get_precision(self.contract.tick_size)
+        self._qty_precision = get_precision(self.contract.step_size)
         log.info("Contract: tick=%.6f step=%.6f size=%.6f min_notional=%.2f",
                  self.contract.tick_size, self.contract.step_size,
                  self.contract.contract_size, self.contract.min_notional)
@@ -156,8 +287,8 @@ class HibachiMarketMakerEngine:
 
     def bootstrap_atr(self):
         try:
-            timeframe = self.params.get("atrTimeframe", "5m")
-            atr_len = int(self.params["atrLen"])
+            timeframe = self.p.atr_timeframe
+            atr_len = self.p.atr_len
             limit = min(atr_len + 10, 100)
 
             klines = self.rest.get_klines(self.symbol, interval=timeframe, limit=limit)
@@ -166,12 +297,9 @@ class HibachiMarketMakerEngine:
                 log.warning("Could not fetch klines for ATR initialization")
                 return
 
-            count = 0
-            for candle in klines:
-                if isinstance(candle, (list, tuple)) and len(candle) >= 5:
-                    o, h, l, c = float(candle[1]), float(candle[2]), float(candle[3]), float(candle[4])
-                    self.atr.update_bar(o, h, l, c, closed=True)
-                    count += 1
+            bars = klines_to_bars(klines)
+            self.atr.warmup(bars)
+            count = len(bars)
 
             if self.atr.rma:
                 log.info("ATR initialized from %d %s candles: %.2f", count, timeframe, self.atr.rma)
@@ -210,32 +338,43 @@ class HibachiMarketMakerEngine:
             log.error("Bootstrap failed: %s", e)
             raise
 
+    def close(self):
+        self._pool.shutdown(wait=True)
+
+    def _apply_account(self, account: dict, position: Optional[dict]):
+        self.state.equity_usd = float(account.get('balance', 0))
+        if position:
+            self.state.pos_qty = float(position.get('size', 0))
+            mark_price = position.get('markPrice') or position.get('mark_price')
+            if mark_price:
+                self.state.mark_price = float(mark_price)
+        self.state.last_equity_update = time.monotonic()
+
     def _force_equity_update(self) -> float:
         try:
             account = self.rest.get_account_info()
-            self.state.equity_usd = float(account.get('balance', 0))
             position = self.rest.get_position(self.symbol)
-            if position:
-                self.state.pos_qty = float(position.get('size', 0))
-                mark_price = position.get('markPrice') or position.get('mark_price')
-                if mark_price:
-                    self.state.mark_price = float(mark_price)
-            self.state.last_equity_update = time.time()
+            self._apply_account(account, position)
         except Exception as e:
             log.error("Update equity failed: %s", e)
         return self.state.equity_usd
 
+    def _equity_update_due(self) -> bool:
+        return (time.monotonic() - self.state.last_equity_update) >= 60
+
     def compute_equity_usd(self, force: bool = False) -> float:
-        if force or (time.time() - self.state.last_equity_update) >= 60:
+        if force or self._equity_update_due():
             return self._force_equity_update()
         return self.state.equity_usd
 
-    def update_bar_from_ticker(self):
-        ticker = self.rest.get_ticker(self.symbol)
+    def update_bar_from_ticker(self, ticker: Optional[dict] = None) -> Optional[dict]:
+        """Fold the ticker into the current bar; returns it for reuse within the step"""
+        if ticker is None:
+            ticker = self.rest.get_ticker(self.symbol)
         if not ticker:
-            return
+            return ticker
 
-        last_price = _to_float(ticker.get('lastPrice') or ticker.get('last_price') or ticker.get('last'))
+        last_price = to_float(ticker.get('lastPrice') or ticker.get('last_price') or ticker.get('last'))
         if last_price:
             if self.state.last_bar.c == 0:
                 self.state.last_bar = Bar(last_price, last_price, last_price, last_price, True)
@@ -244,13 +383,15 @@ class HibachiMarketMakerEngine:
                 self.state.last_bar.h = max(self.state.last_bar.h, last_price)
                 self.state.last_bar.l = min(self.state.last_bar.l, last_price)
 
-            mark = _to_float(ticker.get('markPrice') or ticker.get('mark_price'))
+            mark = to_float(ticker.get('markPrice') or ticker.get('mark_price'))
             if mark:
                 self.state.mark_price = mark
+        return ticker
 
-    def compute_mid(self) -> Optional[float]:
+    def compute_mid(self, mid: Optional[float] = None) -> Optional[float]:
         try:
-            mid = self.rest.get_mid_price(self.symbol)
+            if mid is None:
+                mid = self.rest.get_mid_price(self.symbol)
             if mid and mid > 0:
                 self.state.mark_price = mid
                 return mid
@@ -260,26 +401,39 @@ class HibachiMarketMakerEngine:
             log.error("compute_mid error: %s", e)
             return None
 
-    def get_funding_rate(self) -> Optional[float]:
-        ticker = self.rest.get_ticker(self.symbol)
-        if ticker:
-            return _to_float(ticker.get('fundingRate') or ticker.get('funding_rate'))
-        return None
-
     def step(self):
         if not self.contract:
             return
 
-        self.update_bar_from_ticker()
-        m = self.compute_mid()
+        # Independent reads go out concurrently; state is applied here, in order
+        pool = self._pool
+        ws = self.ws
+        ws_mid = ws.mid() if ws else None
+        ticker_f = pool.submit(self.rest.get_ticker, self.symbol)
+        equity_due = self._equity_update_due()
+        if equity_due:
+            account_f = pool.submit(self.rest.get_account_info)
+            position_f = pool.submit(self.rest.get_position, self.symbol)
+
+        ticker = self.update_bar_from_ticker(ticker_f.result() or {})
+        # The ticker already carries the price get_mid_price would fetch again;
+        # the orderbook-backed lookup is only needed when it has none
+        mid = ws_mid or _ticker_price(ticker) or None
+        m = self.compute_mid(mid)
         if not m or m <= 0:
             log.warning("No valid mid price")
             return
 
-        funding = self.get_funding_rate()
+        funding = _extract_funding_rate(ticker)
         if funding and abs(funding) > 0.01:
             log.warning("High funding rate: %.4f%%", funding * 100)
 
+        if equity_due:
+            try:
+                self._apply_account(account_f.result(), position_f.result())
+            except Exception as e:
+                log.error("Update equity failed: %s", e)
+
         b = self.state.last_bar
         if b.c > 0:
             atr_val, tr1 = self.atr.update_bar(b.o, b.h, b.l, b.c, True)
@@ -292,68 +446,32 @@ class HibachiMarketMakerEngine:
 
         atr_val = max(atr_val, m * 0.0005)
 
-        big_move = (self.params.get("slipGuardATR", 0) > 0 and tr1 > self.params["slipGuardATR"] * atr_val)
+        big_move = (self.p.slip_guard_atr > 0 and tr1 > self.p.slip_guard_atr * atr_val)
 
         if self.state.prev_mid is None:
             mid_changed = True
         else:
-            mid_changed = abs(m - self.state.prev_mid) > bps_to_price(m, self.params.get("requoteBps", 10.0))
+            mid_changed = abs(m - self.state.prev_mid) > m * self._requote_frac
 
         should_quote = (not big_move) and mid_changed
 
-        equity = self.compute_equity_usd()
+        equity = self.state.equity_usd
         position_notional = self.state.pos_qty * m
-        max_notional = equity * (self.params["invBudgetPct"] / 100)
+        max_notional = equity * self._inv_budget_frac
 
         if max_notional <= 0:
             log.warning("Invalid max_notional: %.2f", max_notional)
             return
 
-        skew = clamp(position_notional / max_notional if max_notional > 0 else 0, -1.0, 1.0)
-
-        half_floor = bps_to_price(m, self.params["minFullBps"] * 0.5)
-        half_ceil = bps_to_price(m, self.params["maxFullBps"] * 0.5)
-        half_w = clamp(self.params["kATR"] * atr_val, half_floor, half_ceil)
-
-        bull_shift = bps_to_price(m, self.params.get("bullBiasBps", 0)) if self.params.get("useBullBias",
-                                                                                           False) else 0.0
-
-        sgn = 1.0 if skew > 0 else (-1.0 if skew < 0 else 0.0)
-        inv_offset = self.params.get("skewDamp", 0.3) * abs(skew) * half_w * sgn
-
-        ask_px = m + half_w + bull_shift - inv_offset
-        bid_px = m - half_w + bull_shift - inv_offset
-
-        # 🔧 FIX: Enforce minimum spread from mid (safety margin)
-        min_spread_pct = 0.0015  # 0.15% минимум от mid
-        min_offset = m * min_spread_pct
-
-        # Проверяем, что bid ниже mid, а ask выше mid
-        if bid_px >= m - min_offset:
-            bid_px = m - min_offset
-            log.debug("⚠️ Bid too close to mid, adjusted to %.2f", bid_px)
-
-        if ask_px <= m + min_offset:
-            ask_px = m + min_offset
-            log.debug("⚠️ Ask too close to mid, adjusted to %.2f", ask_px)
-
-        base_usd = pct_of(equity, self.params["baseOrderPct"])
-        size_amp = self.params.get("sizeAmp", 1.5)
-        ask_mult = 1.0 + size_amp * max(0.0, skew)
-        bid_mult = 1.0 + size_amp * max(0.0, -skew)
-
-        bid_notional = base_usd * bid_mult
-        ask_notional = base_usd * ask_mult
+        bid_px, ask_px, bid_qty, ask_qty, skew, half_w = compute_quotes(
+            m, atr_val, self.state.pos_qty, equity, self._qp)
 
         if bid_px <= 0 or ask_px <= 0:
             log.error("Invalid prices: bid_px=%.2f ask_px=%.2f", bid_px, ask_px)
             return
 
-        bid_contracts = bid_notional / bid_px
-        ask_contracts = ask_notional / ask_px
-
-        bid_qty_q = self.contract.q_qty(bid_contracts)
-        ask_qty_q = self.contract.q_qty(ask_contracts)
+        bid_qty_q = self.contract.q_qty(bid_qty)
+        ask_qty_q = self.contract.q_qty(ask_qty)
 
         ask_px_q = self.contract.q_price_ceil(ask_px)
         bid_px_q = self.contract.q_price_floor(bid_px)
@@ -363,18 +481,16 @@ class HibachiMarketMakerEngine:
             return
 
         # 🔧 FIX: Final sanity check after quantization
-        if bid_px_q >= m:
-            log.error("❌ BID ABOVE MID after quantization! bid=%.2f mid=%.2f", bid_px_q, m)
-            bid_px_q = self.contract.q_price_floor(m - min_offset)
-            log.info("✓ Corrected bid to %.2f", bid_px_q)
-
-        if ask_px_q <= m:
-            log.error("❌ ASK BELOW MID after quantization! ask=%.2f mid=%.2f", ask_px_q, m)
-            ask_px_q = self.contract.q_price_ceil(m + min_offset)
-            log.info("✓ Corrected ask to %.2f", ask_px_q)
+        min_offset = m * MIN_SPREAD_PCT
+        if not bid_px_q < m < ask_px_q:
+            log.error("❌ QUOTE CROSSES MID after quantization! bid=%.2f ask=%.2f mid=%.2f",
+                      bid_px_q, ask_px_q, m)
+            bid_px_q = min(bid_px_q, self.contract.q_price_floor(m - min_offset))
+            ask_px_q = max(ask_px_q, self.contract.q_price_ceil(m + min_offset))
+            log.info("✓ Corrected to bid=%.2f ask=%.2f", bid_px_q, ask_px_q)
 
         can_buy = position_notional < max_notional
-        if self.params.get("longBiasOnly", False):
+        if self.p.long_bias_only:
             can_sell = self.state.pos_qty > 0
         else:
             can_sell = position_notional > -max_notional
@@ -394,119 +510,196 @@ class HibachiMarketMakerEngine:
             if not self._check_rate_limit():
                 return
 
-            self._cancel_both()
             self.state.quote_count += 1
 
+            bid_quote = ask_quote = None
             if can_buy and bid_ok:
-                new_bid = self._place_limit("BUY", bid_px_q, bid_qty_q)
-                if new_bid.order_id:
-                    self.state.bid = new_bid
-                    log.debug("Saved BID order_id: %s", new_bid.order_id)
-            else:
+                bid_quote = (bid_px_q, bid_qty_q)
+            elif log.isEnabledFor(logging.DEBUG):
                 if not can_buy:
                     log.debug("Skip BID: limit (%.2f >= %.2f)", position_notional, max_notional)
-                elif not bid_ok:
+                else:
                     log.debug("Skip BID: notional %.2f < %.2f or qty %.6f < %.6f",
                               bid_notional_check, min_notional_check, bid_qty_q, self.contract.min_qty)
 
             if can_sell and ask_ok:
-                new_ask = self._place_limit("SELL", ask_px_q, ask_qty_q)
-                if new_ask.order_id:
-                    self.state.ask = new_ask
-                    log.debug("Saved ASK order_id: %s", new_ask.order_id)
-            else:
+                ask_quote = (ask_px_q, ask_qty_q)
+            elif log.isEnabledFor(logging.DEBUG):
                 if not can_sell:
-                    if self.params.get("longBiasOnly", False):
+                    if self.p.long_bias_only:
                         log.debug("Skip ASK: long-only (pos=%.6f)", self.state.pos_qty)
                     else:
                         log.debug("Skip ASK: limit (%.2f <= %.2f)", position_notional, -max_notional)
-                elif not ask_ok:
+                else:
                     log.debug("Skip ASK: notional %.2f < %.2f or qty %.6f < %.6f",
                               ask_notional_check, min_notional_check, ask_qty_q, self.contract.min_qty)
 
+            self._requote(bid_quote, ask_quote)
+
             self.state.prev_mid = m
 
     def _new_client_id(self) -> str:
-        return f"mm_{int(time.time() * 1000)}_{random.randint(1000, 9999)}"
-
-    def _place_limit(self, side: str, price: float, qty: float) -> SideState:
-        cid = self._new_client_id()
-        price_precision = get_precision(self.contract.tick_size)
-        qty_precision = get_precision(self.contract.step_size)
-        price_str = f"{price:.{price_precision}f}"
-        qty_str = f"{qty:.{qty_precision}f}"
+        return f"mm_{now_ms()}_{random.randint(1000, 9999)}"
+
+    def _limit_order(self, side: str, price: float, qty: float) -> dict:
+        # Rounded once; the same floats go to the client and into SideState
+        return {
+            "action": "place", "symbol": self.symbol, "side": side,
+            "price": round(price, self._price_precision),
+            "quantity": round(qty, self._qty_precision),
+            "postOnly": self.p.post_only,
+        }
+
+    def _requote(self, bid: Optional[tuple], ask: Optional[tuple]):
+        """Bring resting quotes in line with bid/ask in one batch request
+
+        bid/ask are (price, qty) or None to leave that side empty. A resting
+        order that already matches is left alone; one that has to move is
+        amended in place instead of being cancelled and re-placed.
+        """
+        cancels = []
+        places = []
+        for label, side, st, quote in (("BID", "BUY", self.state.bid, bid),
+                                       ("ASK", "SELL", self.state.ask, ask)):
+            order = self._limit_order(side, *quote) if quote else None
+            if st.order_id:
+                if order is None:
+                    cancels.append((label, st.order_id))
+                    continue
+                if order["price"] == st.price and order["quantity"] == st.qty:
+                    continue
+                order["action"] = "amend"
+                order["orderId"] = st.order_id
+            if order is not None:
+                places.append(order)
+        actions = [{"action": "cancel", "symbol": self.symbol, "orderId": oid}
+                   for _, oid in cancels] + places
+        if not actions:
+            return
 
+        # Resting ids stay in SideState until their cancel or amend is known to
+        # have gone through: the SDK fails a batch as a whole, and a failed batch
+        # leaves every order resting where it was.
         try:
-            res = self.rest.place_order(
-                symbol=self.symbol, side=side, order_type="LIMIT",
-                price=price_str, quantity=qty_str,
-                time_in_force=self.params.get("timeInForce", "GTC"),
-                post_only=bool(self.params.get("postOnly", True)),
-                reduce_only=False, client_order_id=cid
-            )
-
-            oid = None
-            if isinstance(res, dict):
-                oid = (res.get("orderId") or res.get("order_id") or
-                       res.get("id") or res.get("orderID") or res.get("order"))
-
-                if oid:
-                    oid = str(oid)
-                    log.info("PLACE %s @ %s x %s -> %s", side, price_str, qty_str, oid)
-                else:
-                    log.error("PLACE %s @ %s x %s -> NO ORDER_ID!", side, price_str, qty_str)
-                    log.error("Response keys: %s", list(res.keys()))
-                    log.error("Full response: %s", res)
-            else:
-                log.error("PLACE %s: unexpected response type: %s", side, type(res))
-                log.error("Response: %s", res)
-
-            self._increment_order_count()
-            return SideState(cid, oid, float(price_str), float(qty_str))
-
+            results = self.rest.batch_orders(actions)
         except Exception as e:
-            error_msg = str(e)
-            log.error("Place %s FAILED: %s", side, error_msg)
-            log.error("  Price: %s | Qty: %s", price_str, qty_str)
-
-            if "RISK" in error_msg.upper() or "LIMIT" in error_msg.upper():
-                log.error("⚠️ RISK LIMIT EXCEEDED!")
-                log.error("⚠️ Current: BASE_ORDER_PCT=%.1f%%, INV_BUDGET_PCT=%.1f%%",
-                          self.params["baseOrderPct"], self.params["invBudgetPct"])
-                log.error("⚠️ Try: BASE_ORDER_PCT=0.5, INV_BUDGET_PCT=20.0")
-
-            return SideState()
-
-    def _cancel_side(self, side: str):
-        st = self.state.bid if side == "bid" else self.state.ask
+            log.error("Batch requote failed: %s", e)
+            self._requote_singly(cancels, places)
+            return
 
+        for i, (label, oid) in enumerate(cancels):
+            self._cancel_result(label, oid, results[i] if i < len(results) else None)
+
+        debug = log.isEnabledFor(logging.DEBUG)
+        rejected = []
+        for i, order in enumerate(places, start=len(cancels)):
+            res = results[i] if i < len(results) else None
+            st = self._placed_state(order, res)
+            if order["action"] == "amend" and not st.order_id:
+                rejected.append(("BID" if order["side"] == "BUY" else "ASK", order["orderId"]))
+                continue
+            self._save_side(order["side"], st, debug)
+
+        # Only the per-action fallback reports a rejected amend this way
+        for label, oid in rejected:
+            self._cancel_single(label, oid)
+
+    def _requote_singly(self, cancels: list, places: list):
+        """Redo a failed batch one request at a time
+
+        Cancels are retried on their own. An amend is retried alone and, if it
+        fails again, the order is cancelled so it does not rest at a stale price.
+        New orders are not retried; the next requote places them.
+        """
+        for label, oid in cancels:
+            self._cancel_single(label, oid)
+
+        debug = log.isEnabledFor(logging.DEBUG)
+        for order in places:
+            if order["action"] != "amend":
+                self._log_place_failure(order, "batch request failed")
+                continue
+            try:
+                res = self.rest.amend_order(self.symbol, order["orderId"],
+                                            order["quantity"], order["price"])
+            except Exception as e:
+                self._log_place_failure(order, str(e))
+                self._cancel_single("BID" if order["side"] == "BUY" else "ASK", order["orderId"])
+                continue
+            self._save_side(order["side"], self._placed_state(order, res), debug)
+
+    def _save_side(self, side: str, st: SideState, debug: bool):
         if not st.order_id:
-            log.debug("Skip cancel %s: no order_id", side.upper())
             return
+        if side == "BUY":
+            self.state.bid = st
+            if debug:
+                log.debug("Saved BID order_id: %s", st.order_id)
+        else:
+            self.state.ask = st
+            if debug:
+                log.debug("Saved ASK order_id: %s", st.order_id)
 
-        log.debug("Attempting to cancel %s order_id: %s", side.upper(), st.order_id)
-
+    def _cancel_single(self, label: str, oid: str):
         try:
-            result = self.rest.cancel_order(symbol=self.symbol, order_id=st.order_id)
-            status = result.get('status') if isinstance(result, dict) else None
-            if status == 'CANCELED':
-                log.info("CANCEL %s SUCCESS (order_id: %s)", side.upper(), st.order_id)
-            else:
-                log.info("CANCEL %s: status=%s (order_id: %s)", side.upper(), status, st.order_id)
+            res = self.rest.cancel_order(symbol=self.symbol, order_id=oid)
         except Exception as e:
-            error_msg = str(e).lower()
-            if "not found" in error_msg or "unknown order" in error_msg:
-                log.info("CANCEL %s: already filled/cancelled (order_id: %s)", side.upper(), st.order_id)
-            else:
-                log.error("Cancel %s failed: %s (order_id: %s)", side, e, st.order_id)
-        finally:
-            if side == "bid":
-                self.state.bid = SideState()
+            res = {"status": "error", "message": str(e)}
+        self._cancel_result(label, oid, res)
+
+    def _cancel_result(self, label: str, oid: str, res):
+        """Log a cancel and drop the side, unless the order may still be resting"""
+        if isinstance(res, dict) and res.get("status") == "error":
+            error_msg = str(res.get("message"))
+            if "not found" not in error_msg.lower() and "unknown order" not in error_msg.lower():
+                # Keep the id: the next requote or _cancel_both retries it
+                log.error("Cancel %s failed: %s (order_id: %s)", label, error_msg, oid)
+                return
+            log.info("CANCEL %s: already filled/cancelled (order_id: %s)", label, oid)
+        else:
+            log.info("CANCEL %s (order_id: %s)", label, oid)
+        setattr(self.state, label.lower(), SideState())
+
+    def _placed_state(self, order: dict, res) -> SideState:
+        side, price, qty = order["side"], order["price"], order["quantity"]
+        verb = order["action"].upper()
+        if isinstance(res, dict) and res.get("status") == "error":
+            self._log_place_failure(order, str(res.get("message")))
+            return SideState()
+
+        oid = None
+        if isinstance(res, dict):
+            # An amended order keeps its id when the response does not echo it
+            oid = (res.get("orderId") or res.get("order_id") or
+                   res.get("id") or res.get("orderID") or res.get("order") or
+                   order.get("orderId"))
+
+            if oid:
+                oid = str(oid)
+                log.info("%s %s @ %s x %s -> %s", verb, side, price, qty, oid)
             else:
-                self.state.ask = SideState()
+                log.error("%s %s @ %s x %s -> NO ORDER_ID!", verb, side, price, qty)
+                log.error("Response keys: %s", list(res.keys()))
+                log.error("Full response: %s", res)
+        else:
+            log.error("%s %s: unexpected response type: %s", verb, side, type(res))
+            log.error("Response: %s", res)
+
+        self._increment_order_count()
+        return SideState(self._new_client_id(), oid, price, qty)
+
+    def _log_place_failure(self, order: dict, error_msg: str):
+        log.error("%s %s FAILED: %s", order["action"].capitalize(), order["side"], error_msg)
+        log.error("  Price: %s | Qty: %s", order["price"], order["quantity"])
+
+        if "RISK" in error_msg.upper() or "LIMIT" in error_msg.upper():
+            log.error("⚠️ RISK LIMIT EXCEEDED!")
+            log.error("⚠️ Current: BASE_ORDER_PCT=%.1f%%, INV_BUDGET_PCT=%.1f%%",
+                      self.p.base_order_pct, self.p.inv_budget_pct)
+            log.error("⚠️ Try: BASE_ORDER_PCT=0.5, INV_BUDGET_PCT=20.0")
 
     def _cancel_both(self):
         log.debug("Canceling both sides...")
-        self._cancel_side("bid")
-        self._cancel_side("ask")
+        # Cancel-only requote: both resting orders go out in one batch request
+        self._requote(None, None)
         log.debug("Both sides canceled")
\ No newline at end of file
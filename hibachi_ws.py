@@ -0,0 +1,111 @@
+from __future__ import annotations
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Optional, Tuple
+
+from utils import to_float
+
+log = logging.getLogger("hibachi.ws")
+
+# Pushed values older than this are treated as missing; the engine polls REST instead
+BOOK_STALE_AFTER = 2.0
+RECONNECT_MAX_DELAY = 30.0
+# A subscribed market feed that stays silent this long is reconnected
+MARKET_SILENT_AFTER = 10.0
+
+
+async def _disconnect(client: Any):
+    try:
+        await client.disconnect()
+    except Exception as e:
+        log.debug("WS disconnect error: %s", e)
+
+
+class HibachiWS:
+    """Top-of-book push feed, kept fresh on a background thread
+
+    The SDK websocket client is asyncio-based; it runs on its own event loop
+    in a daemon thread and the trading thread only reads the latest bid/ask
+    under a lock. Account state is not streamed: the SDK types only the
+    stream.start snapshot, not the pushes after it, so balance and position
+    stay on the engine's REST poll.
+    """
+
+    def __init__(self, symbol: str, data_api_url: str):
+        self.symbol = symbol
+        self._data_api_url = data_api_url
+
+        self._lock = threading.Lock()
+        self._bid_ask: Optional[Tuple[float, float, float]] = None
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(target=asyncio.run, args=(self._main(),),
+                                        name="hibachi-ws", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def mid(self) -> Optional[float]:
+        """Mid from the pushed best bid/ask, or None if missing or stale"""
+        with self._lock:
+            bid_ask = self._bid_ask
+        if bid_ask is None or time.monotonic() - bid_ask[2] > BOOK_STALE_AFTER:
+            return None
+        return (bid_ask[0] + bid_ask[1]) / 2
+
+    async def _main(self):
+        task = asyncio.ensure_future(self._run_market())
+        while not self._stop.is_set():
+            await asyncio.sleep(0.25)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    async def _run_market(self):
+        from hibachi_xyz import HibachiWSMarketClient
+        from hibachi_xyz.types import WebSocketSubscription, WebSocketSubscriptionTopic
+
+        delay = 1.0
+        while True:
+            client = HibachiWSMarketClient(self._data_api_url)
+            client.on(WebSocketSubscriptionTopic.ASK_BID_PRICE.value, self._on_ask_bid)
+            try:
+                await client.connect()
+                await client.subscribe([
+                    WebSocketSubscription(self.symbol, WebSocketSubscriptionTopic.ASK_BID_PRICE)
+                ])
+                log.info("WS market feed subscribed: %s", self.symbol)
+                delay = 1.0
+                subscribed_at = time.monotonic()
+                # The client's receive loop ends quietly on close; watch for silence instead
+                while True:
+                    await asyncio.sleep(1.0)
+                    with self._lock:
+                        bid_ask = self._bid_ask
+                    last = max(subscribed_at, bid_ask[2] if bid_ask else subscribed_at)
+                    if time.monotonic() - last > MARKET_SILENT_AFTER:
+                        break
+                log.warning("WS market feed silent, reconnecting in %.0fs", delay)
+            except asyncio.CancelledError:
+                await client.disconnect()
+                raise
+            except Exception as e:
+                log.warning("WS market feed error: %s (retry in %.0fs)", e, delay)
+            await _disconnect(client)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RECONNECT_MAX_DELAY)
+
+    async def _on_ask_bid(self, msg: dict):
+        data = msg.get("data") or {}
+        bid = to_float(data.get("bidPrice"))
+        ask = to_float(data.get("askPrice"))
+        if bid and ask and bid > 0 and ask > 0:
+            with self._lock:
+                self._bid_ask = (bid, ask, time.monotonic())
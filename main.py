@@ -1,22 +1,37 @@
 from __future__ import annotations
-import os, logging, time, signal, sys
-from logging.handlers import RotatingFileHandler
+import os, logging, time, signal, sys, queue, atexit, threading
+from logging.handlers import RotatingFileHandler, WatchedFileHandler, QueueHandler, QueueListener
 from pathlib import Path
 
+import requests
+
 from hibachi_client import HibachiRest
 from hibachi_mm_engine import HibachiMarketMakerEngine
+from hibachi_ws import HibachiWS
 from env_config import load_env_config, validate_config
 
-shutdown_requested = False
+shutdown_event = threading.Event()
 
 
 def signal_handler(signum, frame):
-    global shutdown_requested
     print("\n\nShutdown requested...")
-    shutdown_requested = True
+    shutdown_event.set()
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """Enqueue records unformatted; %-formatting runs on the listener thread"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Records never leave the process, so msg/args/exc_info can travel as-is
+        return record
+
 
+def setup_logging(log_dir: str, level: str = "INFO", rotate: bool = True) -> QueueListener:
+    """Route records through a queue; file/console I/O runs on a listener thread
 
-def setup_logging(log_dir: str, level: str = "INFO"):
+    With rotate=False the file is left to an external rotator (logrotate etc.)
+    and is reopened when it is moved away.
+    """
     Path(log_dir).mkdir(parents=True, exist_ok=True)
     fmt = logging.Formatter(
         "%(asctime)s | %(levelname)-8s | %(name)s | %(message)s"
@@ -24,21 +39,25 @@ def setup_logging(log_dir: str, level: str = "INFO"):
     root = logging.getLogger()
     root.setLevel(getattr(logging, level.upper(), logging.INFO))
 
-    fh = RotatingFileHandler(
-        os.path.join(log_dir, "app.log"),
-        maxBytes=5_000_000, backupCount=5, encoding="utf-8"
-    )
+    log_path = os.path.join(log_dir, "app.log")
+    if rotate:
+        fh = RotatingFileHandler(log_path, maxBytes=5_000_000, backupCount=5, encoding="utf-8")
+    else:
+        fh = WatchedFileHandler(log_path, encoding="utf-8")
     fh.setFormatter(fmt)
-    root.addHandler(fh)
 
     ch = logging.StreamHandler()
     ch.setFormatter(fmt)
-    root.addHandler(ch)
 
+    log_queue = queue.SimpleQueue()
+    root.addHandler(_DeferredQueueHandler(log_queue))
+    listener = QueueListener(log_queue, fh, ch, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
 
-def step_with_retry(mm: HibachiMarketMakerEngine, max_retries: int = 3) -> bool:
-    import requests
 
+def step_with_retry(mm: HibachiMarketMakerEngine, max_retries: int = 3) -> bool:
     for attempt in range(max_retries):
         try:
             mm.step()
@@ -76,7 +95,7 @@ def main():
         print(f"ERROR: Invalid configuration: {e}")
         sys.exit(1)
 
-    setup_logging(cfg["logging"]["dir"], cfg["logging"]["level"])
+    setup_logging(cfg["logging"]["dir"], cfg["logging"]["level"], cfg["logging"]["rotate"])
     log = logging.getLogger("main")
 
     log.info("=" * 70)
@@ -98,7 +117,13 @@ def main():
         private_key=api["privateKey"]
     )
 
-    mm = HibachiMarketMakerEngine(rest, bot, cfg["logging"]["dir"])
+    ws = None
+    if api["useWebsocket"]:
+        log.info("Starting websocket market feed...")
+        ws = HibachiWS(bot["symbol"], api["dataApiUrl"])
+        ws.start()
+
+    mm = HibachiMarketMakerEngine(rest, bot, cfg["logging"]["dir"], ws=ws)
 
     try:
         log.info("Bootstrapping contract specifications...")
@@ -118,15 +143,17 @@ def main():
     log.info("=" * 70)
 
     loop_interval = 5.0
-    last_step = 0
+    retry_interval = 0.5
 
     try:
-        while not shutdown_requested:
-            now = time.time()
-            if now - last_step >= loop_interval:
-                if step_with_retry(mm):
-                    last_step = now
-            time.sleep(0.5)
+        # Sleep until the next deadline; signal_handler wakes the wait early
+        while not shutdown_event.is_set():
+            started = time.monotonic()
+            if step_with_retry(mm):
+                next_deadline = started + loop_interval
+            else:
+                next_deadline = time.monotonic() + retry_interval
+            shutdown_event.wait(max(0.0, next_deadline - time.monotonic()))
     except KeyboardInterrupt:
         log.info("Keyboard interrupt")
     finally:
@@ -139,6 +166,11 @@ def main():
                      mm.state.equity_usd, mm.state.pos_qty)
         except Exception as e:
             log.error("Shutdown error: %s", e)
+        finally:
+            mm.close()
+            rest.close()
+            if ws is not None:
+                ws.stop()
         log.info("Goodbye!")
 
 
@@ -4,114 +4,179 @@ Test script to verify API behavior and validate bot assumptions
 Run this BEFORE starting the bot to ensure everything works correctly
 """
 
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
 from hibachi_client import HibachiRest
 from env_config import load_env_config
+from utils import ATR, klines_to_bars
 import logging
 
 logging.basicConfig(level=logging.INFO)
 log = logging.getLogger("test")
 
+# Contract specs are effectively static; reuse them across runs for a day
+CONTRACT_CACHE_DIR = ".contract_cache"
+CONTRACT_CACHE_TTL = 86400.0
 
-def test_contract_info(rest: HibachiRest, symbol: str):
-    """Test 1: Verify contract specifications"""
-    log.info("\n" + "=" * 70)
-    log.info("TEST 1: Contract Information")
-    log.info("=" * 70)
+
+def get_contract_info_cached(rest: HibachiRest, symbol: str) -> Optional[Dict[str, Any]]:
+    """get_contract_info backed by a per-symbol JSON file in CONTRACT_CACHE_DIR"""
+    path = os.path.join(CONTRACT_CACHE_DIR, symbol.replace('/', '_') + ".json")
+    try:
+        if time.time() - os.path.getmtime(path) < CONTRACT_CACHE_TTL:
+            with open(path) as f:
+                return json.load(f)
+    except (OSError, ValueError):
+        pass
 
     contract = rest.get_contract_info(symbol)
+    if contract:
+        try:
+            os.makedirs(CONTRACT_CACHE_DIR, exist_ok=True)
+            # Unique temp name: concurrent probes may refresh the same symbol
+            fd, tmp = tempfile.mkstemp(dir=CONTRACT_CACHE_DIR, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump(contract, f, default=str)
+            os.replace(tmp, path)
+        except OSError as e:
+            log.warning("Could not cache contract %s: %s", symbol, e)
+    return contract
+
+
+class _Report:
+    """One test's output, emitted as a single record so concurrent tests don't interleave"""
+
+    def __init__(self, title: str):
+        self.level = logging.INFO
+        self.lines = [("\n" + "=" * 70, ()), (title, ()), ("=" * 70, ())]
+
+    def add(self, level: int, msg: str, *args: Any):
+        self.lines.append((msg, args))
+        if level > self.level:
+            self.level = level
+
+    def info(self, msg: str, *args: Any):
+        self.add(logging.INFO, msg, *args)
+
+    def warning(self, msg: str, *args: Any):
+        self.add(logging.WARNING, msg, *args)
+
+    def error(self, msg: str, *args: Any):
+        self.add(logging.ERROR, msg, *args)
+
+    def emit(self, ok: bool) -> bool:
+        if log.isEnabledFor(self.level):
+            log.log(self.level, "\n".join(msg % args if args else msg
+                                          for msg, args in self.lines))
+        return ok
+
+
+def test_contract_info(contract: Optional[Dict[str, Any]], symbol: str):
+    """Test 1: Verify contract specifications"""
+    report = _Report("TEST 1: Contract Information")
+
     if not contract:
-        log.error("❌ FAILED: Contract %s not found!", symbol)
-        return False
+        report.error("❌ FAILED: Contract %s not found!", symbol)
+        return report.emit(False)
 
-    log.info("✅ Contract found: %s", symbol)
-    log.info("  tick_size: %s", contract.get('tickSize') or contract.get('tick_size'))
-    log.info("  step_size: %s", contract.get('stepSize') or contract.get('step_size'))
-    log.info("  min_qty: %s", contract.get('minOrderSize') or contract.get('min_order_size'))
-    log.info("  min_notional: %s", contract.get('minNotional') or contract.get('min_notional'))
-    log.info("  contract_size: %s", contract.get('contractSize') or contract.get('contract_size'))
-    return True
+    if log.isEnabledFor(logging.INFO):
+        get = contract.get
+        report.info("✅ Contract found: %s", symbol)
+        report.info("  tick_size: %s", get('tickSize') or get('tick_size'))
+        report.info("  step_size: %s", get('stepSize') or get('step_size'))
+        report.info("  min_qty: %s", get('minOrderSize') or get('min_order_size'))
+        report.info("  min_notional: %s", get('minNotional') or get('min_notional'))
+        report.info("  contract_size: %s", get('contractSize') or get('contract_size'))
+    return report.emit(True)
 
 
-def test_price_data(rest: HibachiRest, symbol: str):
+def test_price_data(rest: HibachiRest, mid: Optional[float], symbol: str):
     """Test 2: Verify price data retrieval"""
-    log.info("\n" + "=" * 70)
-    log.info("TEST 2: Price Data")
-    log.info("=" * 70)
+    report = _Report("TEST 2: Price Data")
+
+    # The two reads are independent; fetch them together
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        prices_f = pool.submit(rest.get_prices, symbol)
+        orderbook_f = pool.submit(rest.get_orderbook, symbol, depth=1)
 
     # Test get_prices
-    prices = rest.get_prices(symbol)
+    prices = prices_f.result()
     if prices:
-        log.info("✅ get_prices() works")
-        log.info("  markPrice: %s", prices.get('markPrice') or prices.get('mark_price'))
-        log.info("  lastPrice: %s", prices.get('lastPrice') or prices.get('last_price'))
+        if log.isEnabledFor(logging.INFO):
+            report.info("✅ get_prices() works")
+            report.info("  markPrice: %s", prices.get('markPrice') or prices.get('mark_price'))
+            report.info("  lastPrice: %s", prices.get('lastPrice') or prices.get('last_price'))
     else:
-        log.warning("⚠️  get_prices() returned None")
+        report.warning("⚠️  get_prices() returned None")
 
     # Test get_mid_price
-    mid = rest.get_mid_price(symbol)
     if mid:
-        log.info("✅ get_mid_price() works: $%.2f", mid)
+        report.info("✅ get_mid_price() works: $%.2f", mid)
     else:
-        log.error("❌ FAILED: get_mid_price() returned None")
-        return False
+        report.error("❌ FAILED: get_mid_price() returned None")
+        return report.emit(False)
 
     # Test orderbook
-    orderbook = rest.get_orderbook(symbol, depth=1)
+    orderbook = orderbook_f.result()
     if orderbook:
         bids = orderbook.get('bids', [])
         asks = orderbook.get('asks', [])
         if bids and asks:
-            log.info("✅ Orderbook works")
-            log.info("  Best bid: %s", bids[0])
-            log.info("  Best ask: %s", asks[0])
+            report.info("✅ Orderbook works")
+            report.info("  Best bid: %s", bids[0])
+            report.info("  Best ask: %s", asks[0])
         else:
-            log.error("❌ FAILED: Empty orderbook")
-            return False
+            report.error("❌ FAILED: Empty orderbook")
+            return report.emit(False)
     else:
-        log.error("❌ FAILED: Could not fetch orderbook")
-        return False
+        report.error("❌ FAILED: Could not fetch orderbook")
+        return report.emit(False)
 
-    return True
+    return report.emit(True)
 
 
-def test_account_data(rest: HibachiRest):
+def test_account_data(rest: HibachiRest, account: Optional[Dict[str, Any]]):
     """Test 3: Verify account data"""
-    log.info("\n" + "=" * 70)
-    log.info("TEST 3: Account Data")
-    log.info("=" * 70)
+    report = _Report("TEST 3: Account Data")
 
-    account = rest.get_account_info()
     if not account:
-        log.error("❌ FAILED: Could not fetch account info")
-        return False
+        report.error("❌ FAILED: Could not fetch account info")
+        return report.emit(False)
 
     balance = float(account.get('balance', 0))
-    log.info("✅ Account balance: $%.2f", balance)
+    report.info("✅ Account balance: $%.2f", balance)
 
     if balance < 10:
-        log.warning("⚠️  WARNING: Low balance ($%.2f). Add funds before trading!", balance)
+        report.warning("⚠️  WARNING: Low balance ($%.2f). Add funds before trading!", balance)
 
-    positions = rest.get_positions()
-    log.info("  Open positions: %d", len(positions))
-    for pos in positions:
-        log.info("    %s: size=%.6f", pos.get('symbol'), pos.get('size', 0))
+    if log.isEnabledFor(logging.INFO):
+        positions = rest.get_positions()
+        # Column per field: one pass over the dicts, then plain list traversal
+        symbols = [pos.get('symbol') for pos in positions]
+        sizes = [float(pos.get('size', 0)) for pos in positions]
+        report.info("  Open positions: %d", len(symbols))
+        for sym, size in zip(symbols, sizes):
+            report.info("    %s: size=%.6f", sym, size)
 
-    return True
+    return report.emit(True)
 
 
-def test_position_calculation(rest: HibachiRest, symbol: str):
+def test_position_calculation(rest: HibachiRest, contract: Optional[Dict[str, Any]],
+                              mid: Optional[float], account: Optional[Dict[str, Any]],
+                              symbol: str):
     """Test 4: Verify position notional calculation"""
-    log.info("\n" + "=" * 70)
-    log.info("TEST 4: Position Notional Calculation")
-    log.info("=" * 70)
+    report = _Report("TEST 4: Position Notional Calculation")
 
-    contract = rest.get_contract_info(symbol)
     position = rest.get_position(symbol)
-    mid = rest.get_mid_price(symbol)
 
-    if not contract or not mid:
-        log.error("❌ FAILED: Missing data for calculation")
-        return False
+    if not contract or not mid or not account:
+        report.error("❌ FAILED: Missing data for calculation")
+        return report.emit(False)
 
     contract_size = float(contract.get('contractSize') or contract.get('contract_size') or 1.0)
 
@@ -122,46 +187,71 @@ def test_position_calculation(rest: HibachiRest, symbol: str):
         notional_with_cs = pos_qty * mid * contract_size
         notional_without_cs = pos_qty * mid
 
-        log.info("  Position size: %.6f", pos_qty)
-        log.info("  Mid price: $%.2f", mid)
-        log.info("  Contract size: %.6f", contract_size)
-        log.info("  Notional WITH contract_size: $%.2f", notional_with_cs)
-        log.info("  Notional WITHOUT contract_size: $%.2f", notional_without_cs)
+        if log.isEnabledFor(logging.INFO):
+            report.info("  Position size: %.6f", pos_qty)
+            report.info("  Mid price: $%.2f", mid)
+            report.info("  Contract size: %.6f", contract_size)
+            report.info("  Notional WITH contract_size: $%.2f", notional_with_cs)
+            report.info("  Notional WITHOUT contract_size: $%.2f", notional_without_cs)
 
         # Check which makes sense
-        account = rest.get_account_info()
         balance = float(account.get('balance', 0))
 
         if abs(notional_with_cs) > balance * 2:
-            log.warning("⚠️  Notional WITH contract_size seems too large")
+            report.warning("⚠️  Notional WITH contract_size seems too large")
         if abs(notional_without_cs) > balance * 2:
-            log.warning("⚠️  Notional WITHOUT contract_size seems too large")
+            report.warning("⚠️  Notional WITHOUT contract_size seems too large")
 
-        log.info("✅ Review the notional calculations above")
-        log.info("   The correct formula should show reasonable notional relative to balance")
+        report.info("✅ Review the notional calculations above")
+        report.info("   The correct formula should show reasonable notional relative to balance")
     else:
-        log.info("✅ No position - skipping calculation")
+        report.info("✅ No position - skipping calculation")
 
-    return True
+    return report.emit(True)
 
 
-def test_klines(rest: HibachiRest, symbol: str):
+def test_klines(klines: Optional[list]):
     """Test 5: Verify klines data"""
-    log.info("\n" + "=" * 70)
-    log.info("TEST 5: Historical Klines")
-    log.info("=" * 70)
+    report = _Report("TEST 5: Historical Klines")
 
-    klines = rest.get_klines(symbol, interval='5m', limit=5)
+    klines = klines[-5:] if klines else klines
     if klines:
-        log.info("✅ Klines available: %d candles", len(klines))
+        report.info("✅ Klines available: %d candles", len(klines))
         if len(klines) > 0:
             last = klines[-1]
-            log.info("  Last candle: O=%.2f H=%.2f L=%.2f C=%.2f",
-                     float(last[1]), float(last[2]), float(last[3]), float(last[4]))
+            report.info("  Last candle: O=%.2f H=%.2f L=%.2f C=%.2f",
+                        float(last[1]), float(last[2]), float(last[3]), float(last[4]))
     else:
-        log.warning("⚠️  Klines not available (ATR will initialize from live ticks)")
+        report.warning("⚠️  Klines not available (ATR will initialize from live ticks)")
 
-    return True
+    return report.emit(True)
+
+
+def test_atr_warmup(klines: Optional[list], atr_len: int):
+    """Test 6: Verify ATR warmup from klines"""
+    report = _Report("TEST 6: ATR Warmup")
+
+    if not klines:
+        report.warning("⚠️  No klines - skipping ATR warmup")
+        return report.emit(True)
+
+    bars = klines_to_bars(klines)
+    atr = ATR(atr_len)
+    atr.warmup(bars)
+    if not atr.rma or atr.rma <= 0:
+        report.error("❌ FAILED: ATR did not warm up from %d candles", len(bars))
+        return report.emit(False)
+
+    report.info("✅ ATR(%d) from %d candles: %.2f", atr_len, len(bars), atr.rma)
+    return report.emit(True)
+
+
+def _result_or_none(name: str, future: Any) -> Any:
+    try:
+        return future.result()
+    except Exception as e:
+        log.error("❌ Fetching %s failed: %s", name, e)
+        return None
 
 
 def main():
@@ -178,21 +268,40 @@ def main():
     symbol = cfg['bot']['symbol']
     log.info("Testing symbol: %s\n", symbol)
 
-    rest = HibachiRest(
+    # One client, and so one pooled HTTP session, serves every probe
+    with HibachiRest(
         api_url=cfg["api"]["apiUrl"],
         data_api_url=cfg["api"]["dataApiUrl"],
         api_key=cfg["api"]["apiKey"],
         account_id=cfg["api"]["accountId"],
         private_key=cfg["api"]["privateKey"]
-    )
-
-    # Run all tests
-    results = []
-    results.append(("Contract Info", test_contract_info(rest, symbol)))
-    results.append(("Price Data", test_price_data(rest, symbol)))
-    results.append(("Account Data", test_account_data(rest)))
-    results.append(("Position Calculation", test_position_calculation(rest, symbol)))
-    results.append(("Klines", test_klines(rest, symbol)))
+    ) as rest:
+        # Reads that several probes share are fetched once, together, up front.
+        # Contract specs are also kept on disk; delete CONTRACT_CACHE_DIR to refetch.
+        # One kline history feeds both the candle printout and the ATR warmup.
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            shared = {
+                "contract": pool.submit(get_contract_info_cached, rest, symbol),
+                "mid": pool.submit(rest.get_mid_price, symbol),
+                "account": pool.submit(rest.get_account_info),
+                "klines": pool.submit(rest.get_klines, symbol,
+                                      interval=cfg['bot']['atrTimeframe'], limit=200),
+            }
+        contract, mid, account, klines = (_result_or_none(name, f) for name, f in shared.items())
+
+        # Run all tests; they only read, so they go out concurrently
+        tests = [
+            ("Contract Info", test_contract_info, (contract, symbol)),
+            ("Price Data", test_price_data, (rest, mid, symbol)),
+            ("Account Data", test_account_data, (rest, account)),
+            ("Position Calculation", test_position_calculation,
+             (rest, contract, mid, account, symbol)),
+            ("Klines", test_klines, (klines,)),
+            ("ATR Warmup", test_atr_warmup, (klines, cfg['bot']['atrLen'])),
+        ]
+        with ThreadPoolExecutor(max_workers=len(tests)) as pool:
+            futures = [(name, pool.submit(fn, *args)) for name, fn, args in tests]
+            results = [(name, future.result()) for name, future in futures]
 
     # Summary
     log.info("\n" + "=" * 70)
@@ -3,8 +3,13 @@ from hibachi_xyz import HibachiApiClient
 from dotenv import load_dotenv
 import os
 
+from hibachi_client import install_pooled_session
+
 load_dotenv()
 
+# HibachiApiClient takes no session argument; pool its module-level requests calls
+session = install_pooled_session()
+
 client = HibachiApiClient(
     api_url=os.getenv("HIBACHI_API_ENDPOINT"),
     data_api_url=os.getenv("HIBACHI_DATA_API_ENDPOINT"),
@@ -23,23 +28,36 @@ for method in sorted(methods):
 print("\n" + "=" * 70)
 print("Testing orderbook for BTC/USDT-P...")
 print("=" * 70)
+
+
+def _levels(book, side):
+    """Price levels for one side, read straight off the typed response (no model_dump)"""
+    for key in (side, side + 's'):
+        levels = book.get(key) if isinstance(book, dict) else getattr(book, key, None)
+        if levels:
+            return levels
+    return []
+
+
+def _price(level):
+    if isinstance(level, (list, tuple)):
+        return float(level[0])
+    if isinstance(level, dict):
+        return float(level['price'])
+    return float(getattr(level, 'price', level))
+
+
 try:
-    orderbook = client.get_orderbook(symbol="BTC/USDT-P")
+    orderbook = client.get_orderbook(symbol="BTC/USDT-P", depth=3, granularity=0.1)
     print(f"Type: {type(orderbook)}")
-    if hasattr(orderbook, 'model_dump'):
-        data = orderbook.model_dump()
-    elif hasattr(orderbook, 'dict'):
-        data = orderbook.dict()
-    else:
-        data = orderbook
-
-    print(f"Bids (first 3): {data.get('bids', [])[:3]}")
-    print(f"Asks (first 3): {data.get('asks', [])[:3]}")
-
-    if data.get('bids') and data.get('asks'):
-        best_bid = float(data['bids'][0][0]) if isinstance(data['bids'][0], list) else float(data['bids'][0])
-        best_ask = float(data['asks'][0][0]) if isinstance(data['asks'][0], list) else float(data['asks'][0])
-        mid = (best_bid + best_ask) / 2
+    bids = _levels(orderbook, 'bid')
+    asks = _levels(orderbook, 'ask')
+
+    print(f"Bids (first 3): {bids[:3]}")
+    print(f"Asks (first 3): {asks[:3]}")
+
+    if bids and asks:
+        mid = (_price(bids[0]) + _price(asks[0])) / 2
         print(f"Mid price: ${mid:.2f}")
 except Exception as e:
     print(f"Error: {e}")
\ No newline at end of file
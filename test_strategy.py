@@ -60,9 +60,263 @@ def test_order_sizing():
     return passed == len(tests)
 
 
+def test_compute_quotes():
+    from hibachi_mm_engine import QuoteParams, compute_quotes
+
+    print("\n" + "=" * 70)
+    print("TEST: Quote Computation")
+    print("=" * 70)
+
+    qp = QuoteParams(k_atr=0.75, min_full_half_frac=0.0025, max_full_half_frac=0.02,
+                     bull_bias_frac=0.0, skew_damp=0.3, size_amp=1.5,
+                     inv_budget_frac=0.5, base_order_frac=0.02)
+    mid, atr, equity = 50000.0, 200.0, 10000.0
+
+    tests = [
+        ("Flat", 0.0, 0.0),
+        ("Half long", 0.05, 0.5),
+        ("Max short", -0.2, -1.0),
+    ]
+
+    passed = 0
+    for name, pos, exp_skew in tests:
+        bid, ask, bid_qty, ask_qty, skew, half_w = compute_quotes(mid, atr, pos, equity, qp)
+        ok = (bid < mid < ask and abs(skew - exp_skew) < 0.01 and
+              ((skew > 0) == (ask_qty > bid_qty) or skew == 0) and
+              ask - bid >= 2 * mid * 0.0015)
+        status = "PASS" if ok else "FAIL"
+        print(f"{status}: {name} | bid={bid:.2f} ask={ask:.2f} skew={skew:+.3f} hw={half_w:.2f}")
+        if ok:
+            passed += 1
+
+    print(f"\nResult: {passed}/{len(tests)} passed")
+    return passed == len(tests)
+
+
+def test_quantize():
+    from utils import ContractSpec
+
+    print("\n" + "=" * 70)
+    print("TEST: Price/Qty Quantization")
+    print("=" * 70)
+
+    spec = ContractSpec("BTC/USDT-P", tick_size=0.0001, step_size=0.001)
+    cent = ContractSpec("BTC/USDT-P", tick_size=0.01, step_size=0.001)
+    coarse = ContractSpec("BTC/USDT-P", tick_size=2.5, step_size=0.3)
+    tests = [
+        ("Floor stays below a near-grid price", spec.q_price(116563.85819990652), 116563.8581),
+        ("Ceil of a near-grid price", spec.q_price_ceil(116563.85819990652), 116563.8582),
+        ("On-grid price is unchanged", spec.q_price_ceil(0.3), 0.3),
+        ("Ceil of float noise above the grid", spec.q_price_ceil(0.1 * 3), 0.3001),
+        ("Floor never rounds up to the next tick", cent.q_price(4767.899999999999), 4767.89),
+        ("Qty rounds down", spec.q_qty(0.0019999), 0.001),
+        ("Coarse grid floor", coarse.q_price(50003.7), 50002.5),
+        ("Coarse grid ceil", coarse.q_price_ceil(50001.0), 50002.5),
+        ("Non-binary step", coarse.q_qty(0.9), 0.9),
+    ]
+
+    passed = 0
+    for name, got, expected in tests:
+        ok = got == expected
+        print(f"{'PASS' if ok else 'FAIL'}: {name} | {got!r} (expected {expected!r})")
+        if ok:
+            passed += 1
+
+    print(f"\nResult: {passed}/{len(tests)} passed")
+    return passed == len(tests)
+
+
+def test_atr_backfill():
+    from utils import ATR
+
+    print("\n" + "=" * 70)
+    print("TEST: ATR Backfill")
+    print("=" * 70)
+
+    bars = [(101.0, 99.0, 100.0), (103.0, 100.5, 102.0), (102.5, 98.0, 99.0),
+            (100.0, 97.5, 98.5), (104.0, 98.0, 103.5), (103.0, 101.0, 102.0)]
+
+    live = ATR(4)
+    for h, l, c in bars:
+        live.update_bar(c, h, l, c, closed=True)
+
+    batch = ATR(4)
+    batch.warmup(bars[:2])
+    batch.warmup(bars[2:])
+
+    ok = abs(batch.rma - live.rma) < 1e-9 and batch.prev_close == live.prev_close
+    status = "PASS" if ok else "FAIL"
+    print(f"{status}: warmup rma={batch.rma:.6f} | per-bar rma={live.rma:.6f}")
+    return ok
+
+
+def test_get_precision():
+    from utils import get_precision
+
+    print("\n" + "=" * 70)
+    print("TEST: Decimal Precision")
+    print("=" * 70)
+
+    tests = [(0.0, 0), (0.001, 3), (0.01, 2), (0.1, 1), (1e-8, 8), (0.25, 2),
+             (0.0005, 4), (1.5, 1), (1.0, 0), (100.0, 0), (2.5, 1)]
+
+    passed = 0
+    for value, expected in tests:
+        got = get_precision(value)
+        ok = got == expected
+        status = "PASS" if ok else "FAIL"
+        print(f"{status}: get_precision({value!r}) = {got} (expected {expected})")
+        if ok:
+            passed += 1
+
+    print(f"\nResult: {passed}/{len(tests)} passed")
+    return passed == len(tests)
+
+
+class _StubRest:
+    """Stands in for HibachiRest order calls: records requests, replays canned results
+
+    An Exception in the queue is raised instead of returned, the way the SDK
+    fails a whole batch.
+    """
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = []
+
+    def _reply(self, call):
+        self.calls.append(call)
+        res = self.results.pop(0)
+        if isinstance(res, Exception):
+            raise res
+        return res
+
+    def batch_orders(self, actions):
+        return self._reply(actions)
+
+    def cancel_order(self, symbol, order_id=None):
+        return self._reply(("cancel", order_id))
+
+    def amend_order(self, symbol, order_id, quantity, price):
+        return self._reply(("amend", order_id))
+
+
+def test_requote():
+    import tempfile
+    from hibachi_mm_engine import HibachiMarketMakerEngine
+
+    print("\n" + "=" * 70)
+    print("TEST: Requote Batching")
+    print("=" * 70)
+
+    cfg = {"symbol": "BTC/USDT-P", "baseOrderPct": 1.0, "invBudgetPct": 30.0, "atrLen": 14,
+           "kATR": 0.75, "minFullBps": 50.0, "maxFullBps": 400.0}
+    rest = _StubRest(
+        [{"orderId": "1"}, {"orderId": "2"}],                   # place both
+        [{"orderId": "1"}],                                     # amend bid
+        RuntimeError("batch rejected"),                         # cancel ask + amend bid
+        {"status": "error", "message": "timeout"},              # cancel ask on its own
+        {"orderId": "1"},                                       # amend bid on its own
+        [{"orderId": "2"}, {"orderId": "1"}],                   # cancel both
+        [{"orderId": "3"}, {"orderId": "4"}],                   # place both
+        RuntimeError("batch rejected"),                         # amend both
+        RuntimeError("post-only would cross"),                  # amend bid on its own
+        {"status": "CANCELED"},                                 # cancel bid on its own
+        {"orderId": "4"},                                       # amend ask on its own
+    )
+
+    with tempfile.TemporaryDirectory() as logs_dir:
+        mm = HibachiMarketMakerEngine(rest, cfg, logs_dir)
+        try:
+            st = mm.state
+            results = []
+
+            mm._requote((100.0, 0.01), (101.0, 0.01))
+            results.append(("Place maps ids by index",
+                            st.bid.order_id == "1" and st.ask.order_id == "2"))
+
+            mm._requote((100.0, 0.01), (101.0, 0.01))
+            results.append(("Unchanged quotes send nothing", len(rest.calls) == 1))
+
+            mm._requote((100.5, 0.01), (101.0, 0.01))
+            amend = rest.calls[-1]
+            results.append(("Moved side is amended in place",
+                            len(amend) == 1 and amend[0]["action"] == "amend" and
+                            st.bid.order_id == "1" and st.bid.price == 100.5))
+
+            mm._requote((100.75, 0.01), None)
+            mixed, single = rest.calls[-3], rest.calls[-2]
+            results.append(("Cancel then amend, in that order",
+                            [a["action"] for a in mixed] == ["cancel", "amend"]))
+            results.append(("Failed batch retries the cancel on its own",
+                            single == ("cancel", "2")))
+            results.append(("Failed batch keeps resting ids",
+                            st.bid.order_id == "1" and st.ask.order_id == "2"))
+            results.append(("Failed batch retries the amend on its own",
+                            rest.calls[-1] == ("amend", "1") and st.bid.price == 100.75))
+
+            mm._cancel_both()
+            results.append(("Cancel both reaches every resting order",
+                            sorted(a["orderId"] for a in rest.calls[-1]) == ["1", "2"] and
+                            st.bid.order_id is None and st.ask.order_id is None))
+
+            mm._requote((100.0, 0.01), (101.0, 0.01))
+            mm._requote((99.0, 0.01), (102.0, 0.01))
+            results.append(("Failed batch retries each amend on its own",
+                            [a["action"] for a in rest.calls[-4]] == ["amend", "amend"] and
+                            rest.calls[-3:] == [("amend", "3"), ("cancel", "3"), ("amend", "4")]))
+            results.append(("Failed amend cancels the resting order",
+                            st.bid.order_id is None and
+                            st.ask.order_id == "4" and st.ask.price == 102.0))
+        finally:
+            mm.close()
+
+    passed = 0
+    for name, ok in results:
+        print(f"{'PASS' if ok else 'FAIL'}: {name}")
+        if ok:
+            passed += 1
+
+    print(f"\nResult: {passed}/{len(results)} passed")
+    return passed == len(results)
+
+
+def test_ws_state():
+    import asyncio
+    import time
+    import hibachi_ws
+    from hibachi_ws import HibachiWS
+
+    print("\n" + "=" * 70)
+    print("TEST: WS Feed State")
+    print("=" * 70)
+
+    ws = HibachiWS("BTC/USDT-P", "https://data-api.example")
+    results = [("Empty feed reads as stale", ws.mid() is None)]
+
+    asyncio.run(ws._on_ask_bid({"topic": "ask_bid_price",
+                                "data": {"bidPrice": "100.0", "askPrice": "102.0"}}))
+    asyncio.run(ws._on_ask_bid({"topic": "ask_bid_price", "data": {"bidPrice": "0"}}))
+    results.append(("Mid from pushed bid/ask", ws.mid() == 101.0))
+
+    ws._bid_ask = (100.0, 102.0, time.monotonic() - hibachi_ws.BOOK_STALE_AFTER - 1)
+    results.append(("Stale book forces REST", ws.mid() is None))
+
+    passed = 0
+    for name, ok in results:
+        print(f"{'PASS' if ok else 'FAIL'}: {name}")
+        if ok:
+            passed += 1
+
+    print(f"\nResult: {passed}/{len(results)} passed")
+    return passed == len(results)
+
+
 def main():
     print("\nHIBACHI MM BOT - STRATEGY TESTS\n")
-    all_ok = test_inventory_skew() and test_order_sizing()
+    all_ok = (test_inventory_skew() and test_order_sizing() and test_compute_quotes()
+              and test_atr_backfill() and test_get_precision() and test_requote()
+              and test_ws_state() and test_quantize())
     print("\n" + "=" * 70)
     if all_ok:
         print("ALL TESTS PASSED")
@@ -1,17 +1,26 @@
 from __future__ import annotations
+import functools
+import math
 import time
 from dataclasses import dataclass
-from decimal import Decimal, getcontext
-
-getcontext().prec = 50
+from decimal import Decimal, ROUND_CEILING, ROUND_FLOOR
+from typing import Any, List, Optional, Tuple
 
 
 def now_ms() -> int:
-    return int(time.time() * 1000)
+    return time.time_ns() // 1_000_000
 
 
-def clamp(x: float, lo: float, hi: float) -> float:
-    return max(lo, min(hi, x))
+def to_float(x: Any) -> Optional[float]:
+    """float(x), or None when x is missing or not numeric"""
+    if x is None:
+        return None
+    if isinstance(x, (int, float)):
+        return float(x)
+    try:
+        return float(x)
+    except (TypeError, ValueError):
+        return None
 
 
 def bps_to_price(px: float, bps: float) -> float:
@@ -22,16 +31,72 @@ def pct_of(x: float, p: float) -> float:
     return x * (p / 100.0)
 
 
+@functools.lru_cache(maxsize=64)
 def get_precision(value: float) -> int:
     """Get number of decimal places for a float value"""
     if value == 0:
         return 0
+    # Whole numbers and powers of ten (the usual tick/step sizes) need no formatting
+    a = abs(value)
+    if a >= 1 and a % 1 == 0:
+        return 0
+    e = -math.floor(math.log10(a))
+    if e > 0 and 1.0 / 10 ** e == a:
+        return e
     s = f"{value:.10f}".rstrip('0').rstrip('.')
     if '.' in s:
         return len(s.split('.')[1])
     return 0
 
 
+def _grid_index(value: float, n: int, up: bool) -> int:
+    """Index i of the grid line i / n at or below value (at or above when up)
+
+    value * n only picks the nearest line; the direction is settled by comparing
+    that line's float against value itself, so float noise never crosses it.
+    """
+    i = round(value * n)
+    if up:
+        if i / n < value:
+            i += 1
+    elif i / n > value:
+        i -= 1
+    return i
+
+
+def _grid_inverse(unit: float) -> Optional[int]:
+    """Integer n with unit == 1/n as floats (0.01 -> 100), or None for other grids"""
+    n = round(1.0 / unit)
+    if n > 0 and 1.0 / n == unit:
+        return n
+    return None
+
+
+@functools.lru_cache(maxsize=16)
+def _is_binary_exact(unit: float) -> bool:
+    return Decimal(unit) == Decimal(str(unit))
+
+
+@functools.lru_cache(maxsize=1024)
+def _quantize_decimal(value: float, unit: float, up: bool) -> float:
+    """Exact decimal quantization for grids that are not 1/n (e.g. tick 2.5)
+
+    Memoized: quotes on a coarse grid keep landing on the same few prices.
+    The grid unit is part of the key, so a spec change never reads stale entries.
+    """
+    # Already on the grid (typical for re-quoted asks): floor == ceil == value.
+    # Only trusted when the unit is exact in binary (2.5, 5.0), so that float
+    # multiples of it are exact decimals too; 0.3 * 3 is not 0.9
+    if _is_binary_exact(unit):
+        k = value / unit
+        if k == int(k) and int(k) * unit == value:
+            return value
+    v = Decimal(str(value))
+    s = Decimal(str(unit))
+    k = (v / s).to_integral_value(rounding=ROUND_CEILING if up else ROUND_FLOOR)
+    return float(k * s)
+
+
 @dataclass
 class ContractSpec:
     symbol: str
@@ -41,11 +106,18 @@ class ContractSpec:
     min_notional: float = 10.0
     contract_size: float = 1.0
 
+    def __post_init__(self):
+        # Grid points are k / n; dividing by an exact integer lands on the
+        # nearest float to the decimal price, so no rounding pass is needed
+        self._tick_n = _grid_inverse(self.tick_size)
+        self._step_n = _grid_inverse(self.step_size)
+
     def q_price(self, price: float) -> float:
         """Quantize price to tick_size (rounds down)"""
-        v = Decimal(str(price))
-        s = Decimal(str(self.tick_size))
-        return float((v // s) * s)
+        n = self._tick_n
+        if n is None:
+            return _quantize_decimal(price, self.tick_size, False)
+        return _grid_index(price, n, False) / n
 
     def q_price_floor(self, price: float) -> float:
         """Round price DOWN to tick_size (for bids)"""
@@ -53,18 +125,24 @@ class ContractSpec:
 
     def q_price_ceil(self, price: float) -> float:
         """Round price UP to tick_size (for asks)"""
-        v = Decimal(str(price))
-        s = Decimal(str(self.tick_size))
-        result = ((v // s) + 1) * s
-        if v % s == 0:
-            return float(v)
-        return float(result)
+        n = self._tick_n
+        if n is None:
+            return _quantize_decimal(price, self.tick_size, True)
+        return _grid_index(price, n, True) / n
 
     def q_qty(self, qty: float) -> float:
         """Quantize quantity to step_size (rounds down)"""
-        v = Decimal(str(qty))
-        s = Decimal(str(self.step_size))
-        return float((v // s) * s)
+        n = self._step_n
+        if n is None:
+            return _quantize_decimal(qty, self.step_size, False)
+        return _grid_index(qty, n, False) / n
+
+
+def klines_to_bars(klines) -> List[Tuple[float, float, float]]:
+    """(high, low, close) per [ts, o, h, l, c, ...] kline row, for ATR.warmup"""
+    return [(float(candle[2]), float(candle[3]), float(candle[4]))
+            for candle in klines
+            if isinstance(candle, (list, tuple)) and len(candle) >= 5]
 
 
 class ATR:
@@ -87,4 +165,35 @@ class ATR:
             self.rma = (1 - self.alpha) * self.rma + self.alpha * tr
         if closed:
             self.prev_close = c
-        return self.rma, tr
\ No newline at end of file
+        return self.rma, tr
+
+    @staticmethod
+    def warmup_rma(highs, lows, closes, length: int,
+                   rma: Optional[float] = None, prev_close: Optional[float] = None) -> Optional[float]:
+        """Wilder RMA of true range over columns of closed bars, optionally seeded"""
+        if not highs:
+            return rma
+        alpha = 1.0 / length
+        keep = 1 - alpha
+        # With no previous close, seeding it with the first high makes the
+        # first TR come out as h - l, so the loop needs no None checks
+        c_prev = highs[0] if prev_close is None else prev_close
+        start = 0
+        if rma is None:
+            h, l = highs[0], lows[0]
+            rma = max(h - l, abs(h - c_prev), abs(l - c_prev))
+            c_prev = closes[0]
+            start = 1
+        for h, l, c in zip(highs[start:], lows[start:], closes[start:]):
+            rma = keep * rma + alpha * max(h - l, abs(h - c_prev), abs(l - c_prev))
+            c_prev = c
+        return rma
+
+    def warmup(self, bars) -> float:
+        """Feed closed (h, l, c) bars in one pass; same result as update_bar per bar"""
+        if not bars:
+            return self.rma
+        highs, lows, closes = zip(*bars)
+        self.rma = self.warmup_rma(highs, lows, closes, self.len, self.rma, self.prev_close)
+        self.prev_close = closes[-1]
+        return self.rma
\ No newline at end of file